@@ -20,6 +20,7 @@ from flask_login import current_user
 
 from src.bot_core import TelegramModerationBot
 from src.config_manager import ConfigManager
+from src.moderation_rules import parse_openai_verdict
 from src.user_management import UserManagementSystem, SystemPromptManager, ConfigurationManager
 
 class DashboardApp:
@@ -766,7 +767,7 @@ class DashboardApp:
                     
                     # Usa il prompt custom per il test
                     response = self.bot.moderation_logic.openai_client.chat.completions.create(
-                        model="gpt-3.5-turbo",
+                        model=self.bot.moderation_logic.openai_model,
                         messages=[
                             {"role": "system", "content": prompt},
                             {"role": "user", "content": message}
@@ -779,9 +780,8 @@ class DashboardApp:
                     result_text = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
                     
                     # Parsing della risposta (stessa logica del bot)
-                    is_inappropriate = "INAPPROPRIATO: SI" in result_text
-                    is_question = "DOMANDA: SI" in result_text
-                    is_disallowed_language = "LINGUA: NON CONSENTITA" in result_text
+                    # Risposta senza il formato atteso: mostrata come appropriata, con la risposta grezza
+                    is_inappropriate, is_question, is_disallowed_language = parse_openai_verdict(result_text) or (False, False, False)
                     
                     return jsonify({
                         'success': True,
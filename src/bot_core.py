@@ -1,10 +1,11 @@
 import asyncio
 import os
 import logging
+import re
 import time
 from datetime import datetime, timedelta
 import concurrent.futures
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
 
 from dotenv import load_dotenv
 import schedule # type: ignore
@@ -25,6 +26,23 @@ from .csv_interface import CSVDataManager
 from .user_management import UserManagementSystem
 
 
+# Parole inglesi comuni che, da sole, non rendono un messaggio breve innocuo
+SHORT_MESSAGE_ENGLISH_WORDS: FrozenSet[str] = frozenset({
+    'hi', 'hello', 'hey', 'how', 'are', 'you', 'what', 'where', 'when',
+    'why', 'who', 'can', 'could', 'would', 'should', 'will', 'thanks',
+    'thank', 'please', 'sorry', 'yes', 'no', 'okay', 'ok', 'bye', 'goodbye',
+    'good', 'bad', 'nice', 'great', 'welcome', 'see', 'the', 'and', 'but'
+})
+# Messaggi brevi composti solo da caratteri "sicuri"
+SHORT_MESSAGE_SAFE_RE = re.compile(r'^[a-zA-Z0-9\s.,!?;:()\-àèéìíîòóùú]*$')
+SHORT_MESSAGE_SAFE_SHORT_RE = re.compile(
+    r'^(si|no|ok|ciao|grazie|prego|bene|male|buono|ottimo|perfetto)$'
+    r'|^[0-9\s\-+/().,]+$'
+    r'|^[.,!?;:\s]+$'
+    r'|^[👍👎❤️😊😢🎉✨🔥💪😍😂🤔😅]+$'
+)
+
+
 class TelegramModerationBot:
     """
     Classe principale del bot Telegram per la moderazione avanzata.
@@ -94,6 +112,9 @@ class TelegramModerationBot:
         }
         self.application: Optional[Application] = None
         self._operation_locks: Dict[str, bool] = {}
+        # Lock per utente (con il numero di handler che lo usano) per moderare in ordine
+        # i messaggi dello stesso utente quando gli update sono gestiti in parallelo
+        self._user_moderation_locks: Dict[int, Tuple[asyncio.Lock, int]] = {}
 
         # NUOVO: Stato di running per dashboard
         self._is_running: bool = False
@@ -131,7 +152,7 @@ class TelegramModerationBot:
             'night_mode_groups_count': len(self.get_night_mode_groups()),
             'cache_stats': {
                 'message_cache_size': len(self.message_cache.messages),
-                'analysis_cache_size': len(self.moderation_logic.analysis_cache.cache)
+                'analysis_cache_size': len(self.moderation_logic.analysis_cache)
             }
         }
 
@@ -159,6 +180,8 @@ class TelegramModerationBot:
             self.moderation_logic.banned_words = self.config_manager.get('banned_words', [])
             self.moderation_logic.whitelist_words = self.config_manager.get('whitelist_words', [])
             self.moderation_logic.allowed_languages = self.config_manager.get('allowed_languages', ["it"])
+            self.moderation_logic.openai_model = self.config_manager.get('openai_model', self.moderation_logic.openai_model)
+            self.moderation_logic.clear_caches()
             
             # Re-schedule night mode se gli orari sono cambiati
             if (old_config.get('night_mode', {}) != self.config_manager.get('night_mode', {})):
@@ -697,8 +720,12 @@ class TelegramModerationBot:
                     f"Possibile SPAM CROSS-GRUPPO da {username} ({user_id}) in {len(groups_involved)} gruppi "
                     f"(similarità: {similarity:.2f}). Messaggio: '{message_text[:50]}...'"
                 )
-                is_inappropriate_content, _, _ = self.moderation_logic.analyze_with_openai(message_text)
+                # Il filtro diretto è locale e già definitivo: OpenAI solo se non basta
                 is_direct_banned = self.moderation_logic.contains_banned_word(message_text)
+                if is_direct_banned:
+                    is_inappropriate_content = True
+                else:
+                    is_inappropriate_content, _, _ = await self.moderation_logic.analyze_with_openai_async(message_text)
 
                 if is_inappropriate_content or is_direct_banned:
                     self.logger.warning(f"Contenuto SPAM CROSS-GRUPPO confermato come inappropriato. Ban e pulizia.")
@@ -739,7 +766,7 @@ class TelegramModerationBot:
             self.logger.info(f"Messaggio {'modificato ' if is_edited else ''}da {username} contiene parole/pattern bannati.")
             motivo_finale_rifiuto = f"parole/pattern bannati (msg {'editato' if is_edited else 'nuovo'})"
             self.bot_stats['messages_deleted_by_direct_filter'] += 1
-            self.moderation_logic.stats['direct_filter_matches'] +=1
+            self.moderation_logic.stats.direct_filter_matches += 1
             
             ban_user_needed = False
             ban_reason = ""
@@ -842,7 +869,7 @@ class TelegramModerationBot:
             return
 
         # 10. Analisi AI completa (OpenAI o fallback)
-        is_inappropriate_ai, is_question_ai, is_disallowed_lang_ai = self.moderation_logic.analyze_with_openai(message_text)
+        is_inappropriate_ai, is_question_ai, is_disallowed_lang_ai = await self.moderation_logic.analyze_with_openai_async(message_text)
         
         action_taken = False
         motivo_finale_rifiuto = ""
@@ -917,13 +944,40 @@ class TelegramModerationBot:
                 approvato=True, domanda=is_question_ai, motivo_rifiuto=""
             )
             
+    async def _moderate_in_user_order(self, update: Update, context: ContextTypes.DEFAULT_TYPE, is_edited: bool):
+        """
+        Esegue _handle_message_moderation un messaggio alla volta per ciascun utente.
+        Con concurrent_updates > 1 i messaggi di utenti diversi restano in parallelo,
+        mentre quelli dello stesso utente (e le sue modifiche) vengono moderati
+        nell'ordine di arrivo: controlli di ban e conteggi non si sovrappongono.
+        """
+        message = update.effective_message
+        user_id = message.from_user.id if message and message.from_user else None
+        if user_id is None:
+            await self._handle_message_moderation(update, context, is_edited=is_edited)
+            return
+
+        lock, users = self._user_moderation_locks.get(user_id, (None, 0))
+        if lock is None:
+            lock = asyncio.Lock()
+        self._user_moderation_locks[user_id] = (lock, users + 1)
+        try:
+            async with lock:
+                await self._handle_message_moderation(update, context, is_edited=is_edited)
+        finally:
+            lock, users = self._user_moderation_locks[user_id]
+            if users <= 1:
+                del self._user_moderation_locks[user_id]
+            else:
+                self._user_moderation_locks[user_id] = (lock, users - 1)
+
     async def filter_new_messages(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler per i nuovi messaggi testuali."""
-        await self._handle_message_moderation(update, context, is_edited=False)
+        await self._moderate_in_user_order(update, context, is_edited=False)
 
     async def filter_edited_messages(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handler per i messaggi testuali modificati."""
-        await self._handle_message_moderation(update, context, is_edited=True)
+        await self._moderate_in_user_order(update, context, is_edited=True)
 
     async def _delete_recent_user_messages_from_cache(self, context: ContextTypes.DEFAULT_TYPE, user_id: int, username: str, chat_ids: List[int]):
         """Elimina i messaggi recenti di un utente (dalla cache) dai gruppi specificati."""
@@ -1112,6 +1166,7 @@ class TelegramModerationBot:
         stats_msg += f"🔸 Risultati da Cache OpenAI: {mod_stats['openai_cache_hits']}\n"
         stats_msg += f"🔸 Tasso Hit Cache: {mod_stats['cache_hit_rate']:.2%}\n"
         stats_msg += f"🔸 Dimensione Cache Analisi: {mod_stats['cache_size']}\n"
+        stats_msg += f"🔸 Messaggi lunghi ridotti per OpenAI: {mod_stats['openai_truncated_messages']}\n"
         stats_msg += f"🔸 Violazioni rilevate da AI: {mod_stats['ai_filter_violations']}\n"
         stats_msg += f"🔸 Match filtro diretto (logica): {mod_stats['direct_filter_matches']}\n\n"
         stats_msg += f"👥 **Contatori Utente:**\n"
@@ -1172,9 +1227,8 @@ class TelegramModerationBot:
             await update.message.reply_text("❌ Non sei autorizzato a eseguire questo comando.")
             return
 
-        cache_size_before = len(self.moderation_logic.analysis_cache.cache)
-        self.moderation_logic.analysis_cache.cache.clear()
-        self.moderation_logic.analysis_cache.access_count.clear()
+        cache_size_before = len(self.moderation_logic.analysis_cache)
+        self.moderation_logic.analysis_cache.clear()
         
         await update.message.reply_text(f"🗑️ Cache AI resettata! Rimossi {cache_size_before} elementi dalla cache.")
         self.logger.info(f"Cache AI resettata da admin {user.username} ({user.id})")
@@ -1394,42 +1448,28 @@ class TelegramModerationBot:
 
     def _is_short_or_emoji_message(self, text: str) -> bool:
         """Verifica se il messaggio è davvero innocuo e breve."""
-        import re
-        
         clean_text = text.strip()
+        clean_lower = clean_text.lower()
         short_max_length = self.config_manager.get('short_message_max_length', 4)
         
-        english_words = {
-            'hi', 'hello', 'hey', 'how', 'are', 'you', 'what', 'where', 'when', 
-            'why', 'who', 'can', 'could', 'would', 'should', 'will', 'thanks', 
-            'thank', 'please', 'sorry', 'yes', 'no', 'okay', 'ok', 'bye', 'goodbye',
-            'good', 'bad', 'nice', 'great', 'welcome', 'see', 'the', 'and', 'but'
-        }
-        
-        if clean_text.lower() in english_words:
+        if clean_lower in SHORT_MESSAGE_ENGLISH_WORDS:
             return False
         
         if len(clean_text) > short_max_length and len(clean_text) < 10:
-            safe_pattern = r'^[a-zA-Z0-9\s.,!?;:()\-àèéìíîòóùú]*$'
-            if re.match(safe_pattern, clean_text):
-                return True
-            else:
-                return False
+            return SHORT_MESSAGE_SAFE_RE.match(clean_text) is not None
         
         if len(clean_text) <= 15:
-            safe_short_patterns = [
-                r'^(si|no|ok|ciao|grazie|prego|bene|male|buono|ottimo|perfetto)$',
-                r'^[0-9\s\-+/().,]+$',
-                r'^[.,!?;:\s]+$',
-                r'^[👍👎❤️😊😢🎉✨🔥💪😍😂🤔😅]+$',
-            ]
-            
-            for pattern in safe_short_patterns:
-                if re.match(pattern, clean_text.lower()):
-                    return True
+            return SHORT_MESSAGE_SAFE_SHORT_RE.match(clean_lower) is not None
         
         return False
 
+    async def _close_moderation_clients(self, application: Application):
+        """Chiude le connessioni HTTP verso OpenAI alla chiusura dell'applicazione."""
+        try:
+            await self.moderation_logic.aclose()
+        except Exception as e:
+            self.logger.warning(f"Errore chiusura client OpenAI: {e}")
+
     def start(self):
         """Avvia il bot con gestione silenziosa degli errori di polling."""
         self.logger.info(f"Avvio del Bot di Moderazione Telegram (PID: {os.getpid()})...")
@@ -1438,7 +1478,17 @@ class TelegramModerationBot:
         self._is_running = True
         self._start_time = datetime.now()
 
-        self.application = Application.builder().token(self.token).build()
+        # Con concurrent_updates > 1 (opzionale) gli update vengono gestiti in parallelo:
+        # i messaggi in attesa dell'analisi AI possono così essere raggruppati in un'unica
+        # richiesta a OpenAI. Vale per tutti gli handler, compresi i comandi admin; i
+        # messaggi dello stesso utente restano in ordine (_moderate_in_user_order)
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(self.config_manager.get_concurrent_updates())
+            .post_shutdown(self._close_moderation_clients)
+            .build()
+        )
 
         # Handlers per messaggi nuovi
         self.application.add_handler(MessageHandler(
@@ -1546,6 +1596,9 @@ class TelegramModerationBot:
                             if hasattr(self.application, 'shutdown'):
                                 self.logger.info("Shutdown application...")
                                 await self.application.shutdown()
+
+                            # post_shutdown viene invocato solo da run_polling
+                            await self._close_moderation_clients(self.application)
                                 
                         except Exception as e:
                             self.logger.warning(f"Errore durante cleanup asincrono: {e}")
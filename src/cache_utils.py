@@ -1,6 +1,85 @@
+import functools
 import hashlib
+import heapq
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple, Optional, Any
+from typing import Callable, Dict, List, Tuple, Optional, Any, Union
+
+
+def bounded_cache_key(text: str, max_length: int = 256) -> Union[str, bytes]:
+    """
+    Restituisce una chiave cache di dimensione limitata per un testo.
+    I testi brevi sono usati così come sono (l'hash di una str è calcolato una
+    volta e memorizzato nell'oggetto); quelli più lunghi di max_length sono
+    sostituiti da un digest di 16 byte dell'intero testo, a dimensione fissa.
+    """
+    if len(text) <= max_length:
+        return text
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+
+
+# Punteggiatura ininfluente per il verdetto: '?' (domanda), simboli di valuta e
+# caratteri tipici di link e contatti vengono invece mantenuti
+_CACHE_KEY_PUNCT_RE = re.compile(r"[^\w\s@/:.+\-?€$]")
+
+
+def normalize_for_cache(message: str) -> str:
+    """
+    Forma canonica di un messaggio per la cache delle analisi: Unicode NFKC,
+    minuscolo, punteggiatura irrilevante rimossa e spazi compattati, così che
+    varianti banali ("Ciao!", "ciao !", "ciao") condividano lo stesso risultato.
+    """
+    text = unicodedata.normalize("NFKC", message).casefold()
+    return " ".join(_CACHE_KEY_PUNCT_RE.sub(" ", text).split())
+
+
+def text_lru_cache(maxsize: int, max_key_length: int = 256) -> Callable:
+    """
+    Decoratore LRU per metodi che ricevono un singolo testo.
+    A differenza di functools.lru_cache la chiave non contiene l'intero messaggio
+    ma una chiave limitata (vedi bounded_cache_key): i messaggi molto lunghi non
+    vengono trattenuti in memoria e l'hashing resta economico.
+    La cache è memorizzata sull'istanza (attributo "_<metodo>_cache"): non
+    trattiene riferimenti all'oggetto e può essere svuotata per singola istanza
+    con metodo.cache_clear(istanza).
+    """
+    def decorator(method: Callable) -> Callable:
+        cache_attribute = f"_{method.__name__}_cache"
+
+        @functools.wraps(method)
+        def wrapper(self, text: str):
+            if not text:
+                return method(self, text)
+            cache = self.__dict__.get(cache_attribute)
+            if cache is None:
+                cache = self.__dict__[cache_attribute] = OrderedDict()
+            key = bounded_cache_key(text, max_key_length)
+            try:
+                cache.move_to_end(key)
+                return cache[key]
+            except KeyError:
+                pass
+            result = method(self, text)
+            cache[key] = result
+            if len(cache) > maxsize:
+                cache.popitem(last=False)
+            return result
+
+        def cache_clear(instance: Any):
+            instance.__dict__.pop(cache_attribute, None)
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
 
 class MessageCache:
     """
@@ -68,40 +147,247 @@ class MessageAnalysisCache:
     """
     Cache per i risultati dell'analisi dei messaggi (es. da OpenAI)
     per evitare richieste ripetute per messaggi identici.
+    Le voci scadono dopo ttl_seconds; a cache piena viene rimossa, tra le voci
+    più vecchie, quella con il punteggio costo × (accessi + 1) più basso: il costo
+    è quello sostenuto per ottenere il risultato (es. millisecondi della richiesta
+    a OpenAI), quindi le voci costose e richieste spesso restano più a lungo.
+    Con db_path (opzionale) i risultati vengono salvati anche in un database SQLite,
+    così sopravvivono ai riavvii del bot: la cache in memoria resta il primo livello
+    e il database viene letto solo quando la voce non è in memoria. Le scritture
+    vengono confermate a gruppi (vedi flush).
+    Le chiavi dipendono anche dallo spazio impostato con set_namespace (es. prompt
+    e modello): cambiandolo, i risultati ottenuti in precedenza non sono più usati.
     """
-    def __init__(self, cache_size: int = 1000):
-        self.cache: Dict[str, Tuple[bool, bool, bool]] = {}
-        self.access_count: Dict[str, int] = {} # Per eventuale policy LRU/LFU
+    # Numero di voci più vecchie tra cui scegliere quella da rimuovere
+    EVICTION_SAMPLE_SIZE = 8
+    # Ogni quante scritture rimuovere dal database le voci scadute
+    DB_PRUNE_INTERVAL = 256
+    # Commit delle scritture ogni DB_COMMIT_INTERVAL voci o dopo DB_COMMIT_MAX_DELAY_SECONDS
+    DB_COMMIT_INTERVAL = 32
+    DB_COMMIT_MAX_DELAY_SECONDS = 5.0
+    # Peso della media mobile del costo, usata per le voci di costo non noto (es. lette dal database)
+    COST_SMOOTHING = 0.1
+
+    def __init__(self, cache_size: int = 1000, ttl_seconds: float = 3600, db_path: Optional[str] = None):
+        self.cache: Dict[bytes, Tuple[bool, bool, bool]] = {}
+        self.access_count: Dict[bytes, int] = {}
+        self.expires_at: Dict[bytes, float] = {}
+        self.cost: Dict[bytes, float] = {}
+        # Scadenze delle voci lette dal database (heap per scadenza): possono scadere
+        # prima di voci inserite in precedenza, quindi fuori dall'ordine di expires_at
+        self._loaded_expiry_heap: List[Tuple[float, bytes]] = []
+        # Costo medio recente (None finché non è noto alcun costo)
+        self._typical_cost: Optional[float] = None
         self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        # Chiave blake2b dello spazio corrente (vuota: digest non chiavato)
+        self._namespace_key = b''
+        self.db: Optional[sqlite3.Connection] = None
+        # La connessione è condivisa tra il bot e la dashboard (thread diversi)
+        self._db_lock = threading.Lock()
+        self._db_writes_since_prune = 0
+        self._db_pending_writes = 0
+        self._db_last_commit = time.monotonic()
+        if db_path:
+            self._open_db(db_path)
+
+    def __len__(self) -> int:
+        """Numero di risultati attualmente in cache (in memoria)."""
+        return len(self.cache)
+
+    def _open_db(self, db_path: str):
+        """Apre (o crea) il database SQLite della cache persistente."""
+        try:
+            if os.path.dirname(db_path):
+                os.makedirs(os.path.dirname(db_path), exist_ok=True)
+            self.db = sqlite3.connect(db_path, check_same_thread=False)
+            # WAL + synchronous NORMAL: scritture senza fsync a ogni commit
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("PRAGMA synchronous=NORMAL")
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS analysis_cache ("
+                "message_hash BLOB PRIMARY KEY, inappropriate INTEGER, question INTEGER, "
+                "disallowed_language INTEGER, expires_at REAL)"
+            )
+            self.db.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (time.time(),))
+            self.db.commit()
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).error(f"Cache analisi persistente non disponibile ({db_path}): {e}")
+            self.db = None
 
-    def _get_message_hash(self, message: str) -> str:
-        """Genera un hash MD5 del messaggio per usarlo come chiave cache."""
-        return hashlib.md5(message.encode('utf-8')).hexdigest()
+    def set_namespace(self, namespace: str):
+        """
+        Imposta lo spazio delle chiavi, ad esempio una firma di prompt e modello.
+        Se cambia, le voci in memoria vengono scartate; quelle nel database restano
+        irraggiungibili e vengono rimosse alla scadenza.
+        """
+        namespace_key = hashlib.blake2b(namespace.encode('utf-8'), digest_size=16).digest()
+        if namespace_key != self._namespace_key:
+            self._namespace_key = namespace_key
+            self.cache.clear()
+            self.access_count.clear()
+            self.expires_at.clear()
+            self.cost.clear()
+            self._loaded_expiry_heap.clear()
+
+    def _get_message_hash(self, message: str) -> bytes:
+        """
+        Genera la chiave cache: digest blake2b di 16 byte del messaggio normalizzato
+        (più rapido di MD5, a dimensione fissa e senza conversione esadecimale),
+        chiavato con lo spazio corrente.
+        """
+        return hashlib.blake2b(normalize_for_cache(message).encode('utf-8'), digest_size=16,
+                               key=self._namespace_key).digest()
+
+    def _remove(self, message_hash: bytes):
+        self.cache.pop(message_hash, None)
+        self.access_count.pop(message_hash, None)
+        self.expires_at.pop(message_hash, None)
+        self.cost.pop(message_hash, None)
+
+    def _purge_expired(self, now: float):
+        """
+        Rimuove le voci scadute. Le voci salvate con set sono in ordine di inserimento,
+        quindi di scadenza: si esaminano solo quelle in testa, senza copiare tutte le
+        chiavi. Quelle lette dal database hanno una scadenza residua e sono seguite
+        a parte, in _loaded_expiry_heap.
+        """
+        while self.expires_at:
+            message_hash = next(iter(self.expires_at))
+            if self.expires_at[message_hash] > now:
+                break
+            self._remove(message_hash)
+        heap = self._loaded_expiry_heap
+        while heap and heap[0][0] <= now:
+            expires_at, message_hash = heapq.heappop(heap)
+            # La voce può essere già stata rimossa o salvata di nuovo con set
+            if self.expires_at.get(message_hash) == expires_at:
+                self._remove(message_hash)
+
+    def _evict_if_full(self, now: float):
+        if len(self.cache) >= self.cache_size:
+            self._purge_expired(now)
+            if len(self.cache) >= self.cache_size:
+                oldest = list(itertools.islice(self.cache, self.EVICTION_SAMPLE_SIZE))
+                self._remove(min(oldest, key=lambda key: self.cost.get(key, 0.0) * (self.access_count.get(key, 0) + 1)))
+
+    def _load_from_db(self, message_hash: bytes) -> Optional[Tuple[bool, bool, bool]]:
+        """Cerca la voce nel database e, se valida, la riporta in memoria."""
+        try:
+            with self._db_lock:
+                row = self.db.execute(
+                    "SELECT inappropriate, question, disallowed_language, expires_at FROM analysis_cache WHERE message_hash = ?",
+                    (message_hash,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).warning(f"Errore lettura cache analisi persistente: {e}")
+            return None
+        if row is None:
+            return None
+        remaining_seconds = row[3] - time.time()
+        if remaining_seconds <= 0:
+            return None
+        analysis_result = (bool(row[0]), bool(row[1]), bool(row[2]))
+        now = time.monotonic()
+        self._evict_if_full(now)
+        self.cache[message_hash] = analysis_result
+        self.access_count[message_hash] = 1
+        self.cost[message_hash] = self._typical_cost or 1.0
+        self.expires_at[message_hash] = now + remaining_seconds
+        heapq.heappush(self._loaded_expiry_heap, (now + remaining_seconds, message_hash))
+        return analysis_result
+
+    def _save_to_db(self, message_hash: bytes, analysis_result: Tuple[bool, bool, bool]):
+        """
+        Scrive la voce nel database. Il commit avviene ogni DB_COMMIT_INTERVAL scritture
+        o se l'ultimo risale a più di DB_COMMIT_MAX_DELAY_SECONDS, non a ogni voce.
+        """
+        try:
+            with self._db_lock:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO analysis_cache VALUES (?, ?, ?, ?, ?)",
+                    (message_hash, *map(int, analysis_result), time.time() + self.ttl_seconds)
+                )
+                self._db_writes_since_prune += 1
+                if self._db_writes_since_prune >= self.DB_PRUNE_INTERVAL:
+                    # Il database non ha limite di voci: quelle scadute vengono rimosse periodicamente
+                    self.db.execute("DELETE FROM analysis_cache WHERE expires_at <= ?", (time.time(),))
+                    self._db_writes_since_prune = 0
+                self._db_pending_writes += 1
+                if (self._db_pending_writes >= self.DB_COMMIT_INTERVAL
+                        or time.monotonic() - self._db_last_commit >= self.DB_COMMIT_MAX_DELAY_SECONDS):
+                    self._commit_db()
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).warning(f"Errore scrittura cache analisi persistente: {e}")
+
+    def _commit_db(self):
+        """Conferma le scritture in sospeso (da chiamare con _db_lock acquisito)."""
+        self.db.commit()
+        self._db_pending_writes = 0
+        self._db_last_commit = time.monotonic()
+
+    def flush(self):
+        """Conferma nel database le scritture in sospeso (es. alla chiusura del bot)."""
+        if self.db is None:
+            return
+        try:
+            with self._db_lock:
+                if self._db_pending_writes:
+                    self._commit_db()
+        except sqlite3.Error as e:
+            logging.getLogger(__name__).warning(f"Errore scrittura cache analisi persistente: {e}")
 
     def get(self, message: str) -> Optional[Tuple[bool, bool, bool]]:
-        """Recupera un risultato di analisi dalla cache, se presente."""
+        """Recupera un risultato di analisi dalla cache, se presente e non scaduto."""
         message_hash = self._get_message_hash(message)
         if message_hash in self.cache:
+            if self.expires_at.get(message_hash, 0) <= time.monotonic():
+                self._remove(message_hash)
+                return None
             self.access_count[message_hash] = self.access_count.get(message_hash, 0) + 1
             return self.cache[message_hash]
+        if self.db is not None:
+            return self._load_from_db(message_hash)
         return None
 
-    def set(self, message: str, analysis_result: Tuple[bool, bool, bool]):
-        """Salva un risultato di analisi nella cache."""
+    def set(self, message: str, analysis_result: Tuple[bool, bool, bool], cost: Optional[float] = None):
+        """
+        Salva un risultato di analisi nella cache. cost è il costo sostenuto per
+        ottenerlo (es. millisecondi); se assente si usa il costo medio recente.
+        """
         message_hash = self._get_message_hash(message)
+        now = time.monotonic()
+        if cost is None:
+            cost = self._typical_cost or 1.0
+        elif self._typical_cost is None:
+            self._typical_cost = cost
+        else:
+            self._typical_cost += self.COST_SMOOTHING * (cost - self._typical_cost)
 
-        if len(self.cache) >= self.cache_size:
-            # Semplice politica FIFO se la cache è piena, rimuovendo il più vecchio (non tracciato)
-            # Per una politica LRU/LFU, bisognerebbe tracciare l'ordine di inserimento o l'uso
-            try:
-                # Rimuovi un elemento a caso o il più vecchio se si tiene traccia
-                # Qui rimuoviamo uno basato sull'ordine di inserimento (dizionari Python 3.7+)
-                oldest_key = next(iter(self.cache))
-                self.cache.pop(oldest_key, None)
-                self.access_count.pop(oldest_key, None)
-            except StopIteration: # Cache era vuota, ma si sta riempiendo
-                pass
-
+        if message_hash in self.cache:
+            # Aggiornamento: la voce torna in fondo all'ordine di scadenza
+            self.expires_at.pop(message_hash, None)
+        else:
+            self._evict_if_full(now)
 
         self.cache[message_hash] = analysis_result
-        self.access_count[message_hash] = 0 # Reset/init access count
\ No newline at end of file
+        self.access_count.setdefault(message_hash, 0)
+        self.expires_at[message_hash] = now + self.ttl_seconds
+        self.cost[message_hash] = cost
+        if self.db is not None:
+            self._save_to_db(message_hash, analysis_result)
+
+    def clear(self):
+        """Svuota la cache, in memoria e nel database."""
+        self.cache.clear()
+        self.access_count.clear()
+        self.expires_at.clear()
+        self.cost.clear()
+        self._loaded_expiry_heap.clear()
+        if self.db is not None:
+            try:
+                with self._db_lock:
+                    self.db.execute("DELETE FROM analysis_cache")
+                    self._commit_db()
+            except sqlite3.Error as e:
+                logging.getLogger(__name__).warning(f"Errore svuotamento cache analisi persistente: {e}")
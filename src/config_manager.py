@@ -108,6 +108,23 @@ class ConfigManager:
             "log_level": "INFO",
             "disable_console_logging": True,
             "drop_pending_updates_on_start": True,
+            "concurrent_updates": 1,
+            "openai_prescreen_enabled": True,
+            "openai_model": "gpt-4o-mini",
+            "openai_base_url": None,
+            "openai_structured_output": True,
+            "openai_max_message_chars": 1500,
+            "openai_cache_size": 1000,
+            "openai_cache_ttl_seconds": 3600,
+            "openai_cache_db_path": None,
+            "openai_max_retries": 1,
+            "openai_timeout_seconds": 6.0,
+            "openai_circuit_breaker_failures": 5,
+            "openai_circuit_breaker_reset_seconds": 30,
+            "openai_max_concurrent_requests": 8,
+            "openai_requests_per_minute": 0,
+            "openai_batch_max_size": 16,
+            "openai_batch_wait_ms": 75,
             "scheduler_check_interval_seconds": 60,
             "startup_night_mode_check_delay_seconds": 20,
             "default_rejection_notification": "❌ Messaggio eliminato. Attenersi alle linee guida del gruppo.\nScrivimi in chat il comando /rules per conoscere le regole del gruppo!",
@@ -158,4 +175,24 @@ class ConfigManager:
                 _config = _config[key]
             else:
                 return default
-        return _config
\ No newline at end of file
+        return _config
+
+    # Numero di update paralleli che python-telegram-bot usa per concurrent_updates: true
+    CONCURRENT_UPDATES_WHEN_TRUE = 256
+
+    def get_concurrent_updates(self) -> int:
+        """
+        Restituisce concurrent_updates come numero di update gestiti in parallelo,
+        con la stessa interpretazione di python-telegram-bot: true vale 256,
+        false (o un valore mancante) 1, un intero il suo valore (minimo 1).
+        """
+        value = self.config.get('concurrent_updates')
+        if value is None:
+            return 1
+        if isinstance(value, bool):
+            return self.CONCURRENT_UPDATES_WHEN_TRUE if value else 1
+        try:
+            return max(1, int(value))
+        except (TypeError, ValueError):
+            logging.warning("concurrent_updates non valido (%r): uso 1.", value)
+            return 1
@@ -1,208 +1,1147 @@
+import asyncio
+import functools
+import json
 import logging
 import os
 import re
-import functools
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from types import MappingProxyType
+from typing import List, Dict, Any, Callable, FrozenSet, Iterable, Mapping, Optional, Set, Tuple, Union
 
 import unidecode
-from openai import OpenAI, OpenAIError
+from openai import AsyncOpenAI, BadRequestError, DefaultAsyncHttpxClient, OpenAI, OpenAIError, RateLimitError
 
 from .config_manager import ConfigManager
-from .cache_utils import MessageAnalysisCache
+from .cache_utils import MessageAnalysisCache, normalize_for_cache, text_lru_cache
 from .user_management import SystemPromptManager
 
+try:
+    # Rilevamento lingua con backend C++ (pycld3), preferito a langdetect se installato
+    import cld3
+    CLD3_AVAILABLE = True
+except ImportError:
+    CLD3_AVAILABLE = False
+
 try:
     import langdetect
     LANGDETECT_AVAILABLE = True
 except ImportError:
     LANGDETECT_AVAILABLE = False
-    logging.getLogger(__name__).warning("Libreria langdetect non trovata. Il rilevamento della lingua sarà limitato.")
+    if not CLD3_AVAILABLE:
+        logging.getLogger(__name__).warning("Libreria langdetect non trovata. Il rilevamento della lingua sarà limitato.")
+
+try:
+    # Parser JSON più veloce per le risposte batch di OpenAI (opzionale)
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+try:
+    # HTTP/2 per il client OpenAI asincrono (opzionale, pacchetto h2: pip install "httpx[http2]")
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+def _trie_alternation(words: Iterable[str]) -> str:
+    """
+    Alternanza regex delle parole fattorizzata per prefissi comuni, ad esempio
+    ['vendo', 'vendita'] -> 'vend(?:ita|o)'. Il motore regex scende un ramo per
+    carattere invece di provare ogni parola a ogni posizione del testo.
+    A parità di prefisso viene preferita la parola più lunga.
+    """
+    trie: Dict[str, Dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node: Dict[str, Dict]) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        if '' in node:
+            return '(?:' + '|'.join(branches) + ')?'
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return render(trie)
+
+
+# Pattern di spam applicati al testo normalizzato. Sono compilati una sola volta
+# in un'unica alternanza: un solo passaggio del motore regex al posto di un
+# re.search per ogni pattern. Ogni pattern è racchiuso in un gruppo di cattura
+# così da poter risalire al pattern corrispondente (lastindex) per i log.
+MASKED_PANIERI_SPAM_PATTERNS: Tuple[str, ...] = (
+    r"chi\s+cerc[ao]\s+panier.*(?:scriv|contatt|privat)",
+    r"cerc[ao]\s+panier.*(?:scriv|contatt|privat)",
+    r"ho\s+(?:material|panier).*(?:scriv|contatt|privat)",
+    r"(?:material|panier).*(?:complet|aggiornat).*(?:scriv|contatt|privat)",
+    r"panier.*disponibil.*(?:scriv|contatt|privat|interessat)",
+    r"panier.*(?:2024|2025|aggiornat).*(?:scriv|contatt|privat|interessat)",
+    r"(?:scriv|contatt).*(?:per|sui)\s+panier",
+    r"panier.*(?:scriv|contatt).*(?:privat|dm)",
+    r"material.*(?:scriv|contatt).*(?:privat|dm)",
+    r"interessat.*(?:scriv|contatt)",
+    r"(?:scriv|contatt).*(?:per|chi)\s+(?:material|panier|appunt)",
+    r"(?:material|panier).*(?:chi|per).*(?:scriv|contatt)",
+    r"vendita.*(?:panier|riassunt|material).*(?:t\.me|telegram|canale)",
+    r"(?:panier|riassunt|material).*vendita.*(?:t\.me|telegram|canale)",
+    r"affidatevi.*(?:unico|solo).*canale.*(?:panier|riassunt|material)",
+    r"canale.*(?:ufficiale|preposto).*(?:vendita|offerta).*(?:panier|riassunt)",
+    r"@panieriunipegasomercatorum",
+    r"@unitelematica",
+)
+
+OBVIOUS_SPAM_PATTERNS: Tuple[str, ...] = (
+    r"(?:vendo|offro).*[0-9]+\s*(?:euro|€).*(?:scriv|contatt|privat|whatsapp|telegram)",
+    r"guadagni?\s+(?:facili|garantiti|sicuri)",
+    r"(?:soldi|euro)\s+facili",
+    r"mining.*pool.*(?:join|entra)",
+    r"zarabotok",
+    r"rabota",
+    r"pishi",
+    r"kontakt",
+)
+
+_SPAM_PATTERN_SOURCES: Tuple[Tuple[str, str], ...] = tuple(
+    [("spam mascherato", pattern) for pattern in MASKED_PANIERI_SPAM_PATTERNS]
+    + [("spam evidente", pattern) for pattern in OBVIOUS_SPAM_PATTERNS]
+)
+_SPAM_PATTERNS_RE = re.compile(
+    "|".join(f"({pattern})" for _, pattern in _SPAM_PATTERN_SOURCES),
+    re.IGNORECASE,
+)
+
+
+# Tabella di cancellazione per str.translate con gli stessi intervalli di emoji e
+# simboli rimossi in precedenza tramite regex: un solo passaggio in C sul testo
+_EMOJI_RANGES: Tuple[Tuple[int, int], ...] = (
+    (0x1F600, 0x1F64F),  # emoticon
+    (0x1F300, 0x1F5FF),  # simboli e pittogrammi
+    (0x1F680, 0x1F6FF),  # trasporti e mappe
+    (0x1F1E0, 0x1F1FF),  # bandiere
+    (0x2702, 0x27B0),
+    (0x24C2, 0x1F251),
+    (0x2600, 0x26FF),
+    (0x2700, 0x27BF),
+)
+_EMOJI_EXTRA_CHARS = "🔴🔵⚪⚫🟠🟡🟢🟣⚽⚾🥎🏀🏐🏈🏉🎱🪀🏓⚠️🚨🚫⛔️🆘🔔🔊📢📣"
+_EMOJI_DELETE_TABLE: Dict[int, None] = dict.fromkeys(
+    [codepoint for low, high in _EMOJI_RANGES for codepoint in range(low, high + 1)]
+    + [ord(char) for char in _EMOJI_EXTRA_CHARS]
+)
+
+# Regex di normalize_text e dei controlli lingua, compilate una sola volta.
+# La formattazione markdown (grassetto, sottolineato, barrato, codice, link)
+# viene rimossa insieme al suo contenuto con un solo passaggio.
+_MARKDOWN_RE = re.compile(r'\*\*.*?\*\*|__.*?__|~~.*?~~|`.*?`|\[.*?\]\(.*?\)')
+# Dopo la traslitterazione il testo è ASCII: i caratteri diversi da [a-z0-9\s@]
+# vengono eliminati con str.translate invece che con una regex
+_NON_ALNUM_DELETE_TABLE: Dict[int, None] = {
+    codepoint: None for codepoint in range(128)
+    if not (chr(codepoint) in "abcdefghijklmnopqrstuvwxyz0123456789@" or chr(codepoint).isspace())
+}
+_PUNCTUATION_RE = re.compile(r'[^\w\s]')
+_PUNCTUATION_ONLY_RE = re.compile(r'^[^\w\s]+$')
+_REPEATED_CHARS_RE = re.compile(r'(.)\1+')
+# Conteggi per alfabeto eseguiti dal motore regex (in C) invece che carattere per carattere
+_CYRILLIC_RE = re.compile(r'[\u0400-\u052f]')
+_NON_LATIN_RE = re.compile(r'[\u0400-\u052f\u0600-\u06ff\u4e00-\u9fff]')  # cirillico, arabo, cinese
+_ALPHA_RE = re.compile(r'[^\W\d_]')
+_NON_ASCII_RUN_RE = re.compile(r'[^\x00-\x7f]+')
+
+
+def _transliterate(text: str) -> str:
+    """
+    Traslittera in ASCII con unidecode solo i tratti non ASCII del testo: la parte
+    ASCII, di solito quasi tutto il messaggio, viene copiata dal motore regex
+    senza passare carattere per carattere da unidecode. Il risultato è identico.
+    """
+    return _NON_ASCII_RUN_RE.sub(lambda match: unidecode.unidecode(match.group()), text)
+
+
+# Link Telegram in tutte le forme note: con o senza schema e "www.", domini
+# t.me / telegram.me / telegram.dog, inviti "+codice" e "joinchat/", anteprime
+# web "/s/canale". Il lookbehind evita falsi positivi come "chat.me/...".
+TELEGRAM_LINK_RE = re.compile(
+    r"(?<![\w.])(?:https?://)?(?:www\.)?(?:t|telegram)\.(?:me|dog)/"
+    r"(?:\+[\w-]+|joinchat/[\w-]+|s/[\w-]+|[\w-]+)",
+    re.IGNORECASE,
+)
+_MENTION_RE = re.compile(r'@\w+')
+# Materiale didattico che, insieme a un link Telegram, indica vendita/spam
+_DIDACTIC_MATERIAL_RE = re.compile(r'panier|riassunt|appunt|material|slide')
+
+# Parole di offerta materiale e di invito usate dal filtro diretto insieme ai
+# link Telegram, ciascun elenco compilato in un'unica alternanza (sottostringhe)
+MATERIAL_OFFER_WORDS: Tuple[str, ...] = (
+    'panieri', 'riassunti', 'appunti', 'materiale', 'slides', 'dispense',
+    'tesi', 'esami', 'soluzioni', 'quiz', 'test', 'simulazioni'
+)
+INVITATION_WORDS: Tuple[str, ...] = (
+    'iscriversi', 'iscrivetevi', 'entrate', 'joinare', 'accedere', 'accesso',
+    'canale', 'gruppo', 'link', 'qui', 'sotto', 'sopra', 'clicca', 'segui'
+)
+_MATERIAL_OFFER_RE = re.compile(_trie_alternation(MATERIAL_OFFER_WORDS))
+_INVITATION_RE = re.compile(_trie_alternation(INVITATION_WORDS))
+
+# Segnali per contains_suspicious_contact_invitation, valutati con una sola
+# chiamata: ogni lookahead opzionale cerca indipendentemente dall'inizio del
+# testo, quindi una categoria non "consuma" il testo delle altre e il gruppo
+# con nome risulta valorizzato se la categoria è presente.
+# Richieste di materiale tra studenti ("qualcuno ha i panieri", "cerco gli appunti"):
+# chi chiede il materiale non lo sta offrendo, anche se propone di sentirsi in privato
+_MATERIAL_REQUEST_PATTERN = (
+    r"(?:(?:qualcun\w*|chi)\s+(?:ha|avrebbe|mi\s+pass\w+|(?:mi\s+)?pu\w+\s+passar\w+)"
+    r"|avete|avreste|cerco|mi\s+serv\w+|mi\s+manca\w*)"
+    r"\s+(?:(?:i|gli|le|il|lo|la|l'|dei|degli|delle|anche)\s*)?"
+    r"(?:panier|appunt|riassunt|material|slides|soluzion)"
+)
+_CONTACT_SIGNAL_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ('legit', r"grupp\w+\s+(?:studio|whatsapp|telegram)|aggiung\w+\s+gruppo|link\s+gruppo"
+              r"|mandat\w+\s+numer\w+|entrare\s+nel\s+gruppo|" + _MATERIAL_REQUEST_PATTERN),
+    ('channel', r"whatsapp|telegram|instagram|dm|direct|privato|@\w+"),
+    ('action', r"scriv\w+|contatt\w+|mand\w+|invia\w+|messaggi\w+"),
+    ('item', r"panier\w+|appunt\w+|material\w+|tesi|esami|soluzion\w+|aiuto|lezioni|slides|aggiornat\w+"),
+)
+_CONTACT_SIGNALS_RE = re.compile(
+    "".join(f"(?=.*?(?P<{name}>{pattern}))?" for name, pattern in _CONTACT_SIGNAL_PATTERNS),
+    re.DOTALL,
+)
+# Termini commerciali che rendono sospetto un invito al contatto anche in un contesto legittimo
+COMMERCIAL_TERMS: Tuple[str, ...] = ("vendo", "offro", "prezzo", "pagamento", "€", "euro")
+_COMMERCIAL_TERMS_RE = re.compile(_trie_alternation(COMMERCIAL_TERMS))
+
+# Indicatori lessicali dell'italiano usati da is_language_disallowed
+ITALIAN_INDICATORS: FrozenSet[str] = frozenset({
+    # Articoli, preposizioni, congiunzioni (molto comuni)
+    'il', 'la', 'lo', 'le', 'gli', 'i', 'un', 'una', 'uno',
+    'del', 'della', 'dello', 'delle', 'degli', 'dei',
+    'nel', 'nella', 'nello', 'nelle', 'negli', 'nei',
+    'dal', 'dalla', 'dallo', 'dalle', 'dagli', 'dai',
+    'al', 'alla', 'allo', 'alle', 'agli', 'ai',
+    'sul', 'sulla', 'sullo', 'sulle', 'sugli', 'sui',
+    'con', 'per', 'tra', 'fra', 'di', 'da', 'in', 'a', 'su',
+    'che', 'chi', 'cui', 'quale', 'quanto', 'dove', 'quando', 'come', 'perché',
+    'e', 'ed', 'o', 'od', 'ma', 'però', 'tuttavia', 'quindi', 'allora', 'infatti',
+    
+    # Pronomi comuni
+    'io', 'tu', 'lui', 'lei', 'noi', 'voi', 'loro',
+    'mi', 'ti', 'ci', 'vi', 'si', 'li', 'ne',
+    'me', 'te', 'se',
+    'questo', 'questa', 'questi', 'queste', 'quello', 'quella', 'quelli', 'quelle',
+    
+    # Verbi essere/avere (essenziali)
+    'è', 'sono', 'sei', 'siamo', 'siete', 'era', 'ero', 'eri', 'erano', 'eravamo', 'eravate',
+    'sarà', 'sarò', 'sarai', 'saremo', 'sarete', 'saranno', 'sia', 'siano', 'fosse', 'fossero',
+    'ho', 'hai', 'ha', 'abbiamo', 'avete', 'hanno', 'aveva', 'avevo', 'avevi', 'avevamo', 'avevate', 'avevano',
+    
+    # Verbi comuni
+    'fai', 'faccio', 'fa', 'fanno', 'fare', 'fatto', 'fatta', 'fatti', 'fatte',
+    'vai', 'vado', 'va', 'vanno', 'andare', 'andato', 'andata', 'andati', 'andate',
+    'do', 'danno', 'dare', 'dato', 'data', 'dati', 'date',
+    'dici', 'dico', 'dice', 'dicono', 'dire', 'detto', 'detta', 'detti', 'dette',
+    'vedi', 'vedo', 'vede', 'vedono', 'vedere', 'visto', 'vista', 'visti', 'viste',
+    'senti', 'sento', 'sente', 'sentono', 'sentire', 'sentito', 'sentita', 'sentiti', 'sentite',
+    'vengo', 'vieni', 'viene', 'veniamo', 'venite', 'vengono', 'venire', 'venuto', 'venuta',
+    'posso', 'puoi', 'può', 'possiamo', 'potete', 'possono', 'potere', 'potuto', 'potuta',
+    'voglio', 'vuoi', 'vuole', 'vogliamo', 'volete', 'vogliono', 'volere', 'voluto', 'voluta',
+    'devo', 'devi', 'deve', 'dobbiamo', 'dovete', 'devono', 'dovere', 'dovuto', 'dovuta',
+    
+    # Parole di uso quotidiano
+    'ciao', 'buongiorno', 'buonasera', 'buonanotte', 'salve', 'arrivederci',
+    'grazie', 'prego', 'scusa', 'scusate', 'perfetto', 'bene', 'male', 'così',
+    'sì', 'no', 'ok', 'okay', 'boh', 'mah', 'beh',
+    'oggi', 'ieri', 'domani', 'ora', 'adesso', 'sempre', 'mai', 'già', 'ancora',
+    'molto', 'poco', 'tanto', 'troppo', 'più', 'meno', 'tutto', 'niente', 'nulla',
+    'anche', 'solo', 'proprio', 'davvero', 'veramente', 'sicuramente', 'forse', 'magari',
+    
+    # AGGIUNTE SPECIFICHE per i casi problematici
+    'gestione', 'periodo', 'estenderanno', 'oscena',
+    'momento', 'situazione', 'problema', 'soluzione', 'informazione', 'comunicazione',
+    'decisione', 'discussione', 'questione', 'posizione', 'condizione', 'attenzione',
+    'direzione', 'protezione', 'produzione', 'costruzione', 'istruzione', 'educazione',
+    
+    # Ambito universitario
+    'università', 'professore', 'prof', 'crediti', 'corso', 'corsi', 'esame', 'esami',
+    'laurea', 'triennale', 'magistrale', 'dottorato', 'facoltà', 'appunti', 'paniere', 'panieri',
+    'lezioni', 'tesi', 'sessione', 'matricola', 'ateneo', 'dipartimento', 'cattedra',
+    'semestre', 'frequenza', 'iscrizione', 'slides', 'slide', 'docente', 'studente',
+    'voti', 'voto', 'votazione', 'valutazione', 'risultato', 'risultati',
+    
+    # Forme verbali comuni che potrebbero essere confuse
+    'resta', 'restano', 'restare', 'rimanere', 'rimane', 'rimangono',
+    'passa', 'passano', 'passare', 'passato', 'passata', 'passati', 'passate',
+    'prende', 'prendono', 'prendere', 'preso', 'presa', 'presi', 'prese',
+    'mette', 'mettono', 'mettere', 'messo', 'messa', 'messi', 'messe',
+    'porta', 'portano', 'portare', 'portato', 'portata', 'portati', 'portate',
+    'trova', 'trovano', 'trovare', 'trovato', 'trovata', 'trovati', 'trovate',
+    'cerca', 'cercano', 'cercare', 'cercato', 'cercata', 'cercati', 'cercate',
+    'chiede', 'chiedono', 'chiedere', 'chiesto', 'chiesta', 'chiesti', 'chieste',
+    'risponde', 'rispondono', 'rispondere', 'risposto', 'risposta', 'risposti', 'risposte',
+    'serve', 'servono', 'servire', 'servito', 'servita', 'serviti', 'servite',
+    'aiuta', 'aiutano', 'aiutare', 'aiutato', 'aiutata', 'aiutati', 'aiutate',
+    'funziona', 'funzionano', 'funzionare', 'funzionato', 'funzionata',
+    'cambia', 'cambiano', 'cambiare', 'cambiato', 'cambiata', 'cambiati', 'cambiate',
+    'aspetta', 'aspettano', 'aspettare', 'aspettato', 'aspettata', 'aspettati', 'aspettate',
+    'finisce', 'finiscono', 'finire', 'finito', 'finita', 'finiti', 'finite',
+    'inizia', 'iniziano', 'iniziare', 'iniziato', 'iniziata', 'iniziati', 'iniziate',
+    'continua', 'continuano', 'continuare', 'continuato', 'continuata',
+    'smette', 'smettono', 'smettere', 'smesso', 'smessa', 'smessi', 'smesse',
+    'cresce', 'crescono', 'crescere', 'cresciuto', 'cresciuta', 'cresciuti', 'cresciute',
+    'scende', 'scendono', 'scendere', 'sceso', 'scesa', 'scesi', 'scese',
+    'sale', 'salgono', 'salire', 'salito', 'salita', 'saliti', 'salite',
+    'esce', 'escono', 'uscire', 'uscito', 'uscita', 'usciti', 'uscite',
+    'entra', 'entrano', 'entrare', 'entrato', 'entrata', 'entrati', 'entrate',
+    'parte', 'partono', 'partire', 'partito', 'partita', 'partiti', 'partite',
+    'torna', 'tornano', 'tornare', 'tornato', 'tornata', 'tornati', 'tornate',
+    'arriva', 'arrivano', 'arrivare', 'arrivato', 'arrivata', 'arrivati', 'arrivate',
+    
+    # Avverbi e aggettivi comuni
+    'nuovo', 'nuova', 'nuovi', 'nuove', 'vecchio', 'vecchia', 'vecchi', 'vecchie',
+    'grande', 'grandi', 'piccolo', 'piccola', 'piccoli', 'piccole',
+    'bello', 'bella', 'belli', 'belle', 'brutto', 'brutta', 'brutti', 'brutte',
+    'buono', 'buona', 'buoni', 'buone', 'cattivo', 'cattiva', 'cattivi', 'cattive',
+    'primo', 'prima', 'primi', 'prime', 'ultimo', 'ultima', 'ultimi', 'ultime',
+    'stesso', 'stessa', 'stessi', 'stesse', 'altro', 'altra', 'altri', 'altre',
+    'importante', 'importanti', 'interessante', 'interessanti', 'difficile', 'difficili',
+    'facile', 'facili', 'possibile', 'possibili', 'impossibile', 'impossibili',
+    'necessario', 'necessaria', 'necessari', 'necessarie', 'libero', 'libera', 'liberi', 'libere',
+    'aperto', 'aperta', 'aperti', 'aperte', 'chiuso', 'chiusa', 'chiusi', 'chiuse',
+    'pieno', 'piena', 'pieni', 'piene', 'vuoto', 'vuota', 'vuoti', 'vuote',
+    'alto', 'alta', 'alti', 'alte', 'basso', 'bassa', 'bassi', 'basse',
+    'lungo', 'lunga', 'lunghi', 'lunghe', 'corto', 'corta', 'corti', 'corte',
+    'largo', 'larga', 'larghi', 'larghe', 'stretto', 'stretta', 'stretti', 'strette',
+    'giovane', 'giovani',
+    'ricco', 'ricca', 'ricchi', 'ricche', 'povero', 'povera', 'poveri', 'povere',
+    'felice', 'felici', 'triste', 'tristi', 'contento', 'contenta', 'contenti', 'contente',
+    'sicuro', 'sicura', 'sicuri', 'sicure', 'incerto', 'incerta', 'incerti', 'incerte',
+    'pronto', 'pronta', 'pronti', 'pronte', 'lento', 'lenta', 'lenti', 'lente',
+    'veloce', 'veloci', 'rapido', 'rapida', 'rapidi', 'rapide',
+    'calmo', 'calma', 'calmi', 'calme', 'nervoso', 'nervosa', 'nervosi', 'nervose',
+    'tranquillo', 'tranquilla', 'tranquilli', 'tranquille', 'agitato', 'agitata', 'agitati', 'agitate',
+    'normale', 'normali', 'strano', 'strana', 'strani', 'strane',
+    'giusto', 'giusta', 'giusti', 'giuste', 'sbagliato', 'sbagliata', 'sbagliati', 'sbagliate',
+    'vero', 'vera', 'veri', 'vere', 'falso', 'falsa', 'falsi', 'false',
+    'serio', 'seria', 'seri', 'serie', 'scherzoso', 'scherzosa', 'scherzosi', 'scherzose',
+    'pubblico', 'pubblica', 'pubblici', 'pubbliche', 'privato', 'privata', 'privati', 'private',
+    'sociale', 'sociali', 'personale', 'personali', 'generale', 'generali', 'particolare', 'particolari',
+    'nazionale', 'nazionali', 'internazionale', 'internazionali', 'locale', 'locali', 'regionale', 'regionali',
+    
+    # Termini tecnici e digitali comuni
+    'computer', 'internet', 'sito', 'email', 'telefono', 'cellulare', 'numero', 'link', 'collegamento',
+    'file', 'documento', 'foto', 'immagine', 'video', 'audio', 'messaggio', 'testo', 'pagina',
+    'gruppo', 'canale', 'chat', 'whatsapp', 'telegram', 'facebook', 'instagram', 'youtube',
+    'google', 'gmail', 'microsoft', 'windows', 'android', 'iphone', 'apple', 'samsung',
+    'password', 'utente', 'account', 'profilo', 'accesso', 'registrazione', 'login',
+    'download', 'upload', 'installare', 'installato', 'installata', 'aggiornare', 'aggiornato', 'aggiornata',
+    'configurare', 'configurato', 'configurata', 'impostare', 'impostato', 'impostata',
+    'connessione', 'connesso', 'connessa', 'disconnesso', 'disconnessa', 'collegato', 'collegata',
+    'online', 'offline', 'digitale', 'virtuale', 'elettronico', 'elettronica',
+    'automatico', 'automatica', 'manuale', 'manuali', 'sistema', 'sistemi', 'programma', 'programmi',
+    'applicazione', 'applicazioni', 'app', 'software', 'hardware', 'device', 'dispositivo', 'dispositivi',
+    'schermo', 'monitor', 'tastiera', 'mouse', 'stampante', 'scanner', 'cavo', 'cavi',
+    'batteria', 'caricatore', 'memoria', 'disco', 'usb', 'wifi', 'bluetooth', 'gps',
+    
+    # Mesi e giorni
+    'gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
+    'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre',
+    'lunedì', 'martedì', 'mercoledì', 'giovedì', 'venerdì', 'sabato', 'domenica',
+    'mattina', 'pomeriggio', 'sera', 'notte', 'giorno', 'giorni', 'settimana', 'settimane',
+    'mese', 'mesi', 'anno', 'anni', 'tempo', 'volta', 'volte', 'ore', 'minuti', 'secondi',
+    
+    # Numeri scritti in lettere
+    'due', 'tre', 'quattro', 'cinque', 'sette', 'otto', 'nove', 'dieci',
+    'undici', 'dodici', 'tredici', 'quattordici', 'quindici', 'sedici', 'diciassette', 'diciotto', 'diciannove', 'venti',
+    'trenta', 'quaranta', 'cinquanta', 'sessanta', 'settanta', 'ottanta', 'novanta', 'cento', 'mille',
+    'secondo', 'terzo', 'quarto', 'quinto', 'sesto', 'settimo', 'ottavo', 'nono', 'decimo',
+    
+    # Espressioni e interiezioni
+    'ecco', 'comunque', 'inoltre', 'invece', 'piuttosto',
+    'soprattutto', 'specialmente', 'particolarmente', 'principalmente', 'generalmente', 'solitamente',
+    'probabilmente', 'possibilmente', 'certamente', 'ovviamente', 'naturalmente',
+    'sfortunatamente', 'fortunatamente', 'improvvisamente', 'immediatamente', 'velocemente', 'lentamente',
+    'attentamente', 'facilmente', 'difficilmente', 'chiaramente', 'completamente', 'perfettamente',
+    'abbastanza', 'parecchio', 'alquanto', 'estremamente', 'incredibilmente',
+    'assolutamente', 'relativamente', 'normalmente', 'regolarmente', 'raramente', 'spesso',
+    'talvolta', 'qualche', 'alcuni', 'alcune', 'parecchi', 'parecchie', 'molti', 'molte',
+    'diversi', 'diverse', 'vari', 'varie', 'certi', 'certe', 'tutti', 'tutte', 'nessuno', 'nessuna',
+    'qualcuno', 'qualcuna', 'qualcosa', 'ovunque', 'dovunque', 'dappertutto',
+    'altrove', 'laggiù', 'lassù', 'quaggiù', 'quassù', 'sopra', 'sotto', 'dentro', 'fuori',
+    'davanti', 'dietro', 'accanto', 'vicino', 'lontano', 'intorno', 'attraverso', 'contro',
+    'verso', 'fino', 'durante', 'dopo', 'mentre', 'appena', 'finché',
+    'sebbene', 'benché', 'nonostante', 'purché', 'affinché', 'poiché', 'siccome',
+    'considerato', 'tranne', 'eccetto', 'salvo', 'oltre', 'incluso', 'compreso'
+})
+
+# Parole inglesi che NON sono ambigue con l'italiano
+STRICT_ENGLISH_ONLY: FrozenSet[str] = frozenset({
+    'hello', 'goodbye', 'please', 'thank', 'thanks', 'welcome', 'sorry',
+    'how', 'what', 'where', 'when', 'why', 'who', 'which',
+    'can', 'could', 'would', 'should', 'will', 'shall', 'might', 'must',
+    'have', 'has', 'had', 'was', 'were', 'been', 'being',
+    'make', 'made', 'take', 'took', 'come', 'came', 'went', 'going',
+    'get', 'got', 'give', 'gave', 'put', 'let', 'set',
+    'think', 'thought', 'know', 'knew', 'see', 'saw', 'look', 'tell', 'said',
+    'want', 'need', 'like', 'love', 'hate', 'feel', 'seem', 'become',
+    'find', 'found', 'keep', 'kept', 'leave', 'left', 'bring', 'brought',
+    'turn', 'turned', 'show', 'showed', 'ask', 'asked', 'try', 'tried',
+    'use', 'used', 'work', 'worked', 'call', 'called', 'move', 'moved',
+    'play', 'played', 'run', 'ran', 'walk', 'walked', 'sit', 'sat',
+    'stand', 'stood', 'read', 'write', 'wrote', 'listen', 'heard',
+    'speak', 'spoke', 'talk', 'talked', 'eat', 'ate', 'drink', 'drank',
+    'sleep', 'slept', 'wake', 'woke', 'open', 'opened', 'close', 'closed',
+    'start', 'started', 'stop', 'stopped', 'finish', 'finished', 'end', 'ended',
+    'begin', 'began', 'continue', 'continued', 'change', 'changed', 'help', 'helped',
+    'learn', 'learned', 'teach', 'taught', 'study', 'studied', 'remember', 'forgot',
+    'understand', 'understood', 'believe', 'believed', 'hope', 'hoped', 'wish', 'wished',
+    'buy', 'bought', 'sell', 'sold', 'pay', 'paid', 'cost', 'spend', 'spent',
+    'live', 'lived', 'stay', 'stayed', 'visit', 'visited', 'travel', 'traveled',
+    'meet', 'met', 'join', 'joined', 'follow', 'followed', 'lead', 'led',
+    'win', 'won', 'lose', 'lost', 'fight', 'fought', 'kill', 'killed',
+    'die', 'died', 'born', 'grow', 'grew', 'build', 'built', 'create', 'created',
+    'destroy', 'destroyed', 'break', 'broke', 'fix', 'fixed', 'repair', 'repaired',
+    'clean', 'cleaned', 'wash', 'washed', 'cook', 'cooked', 'cut',
+    'pull', 'pulled', 'push', 'pushed', 'throw', 'threw', 'catch', 'caught',
+    'hold', 'held', 'carry', 'carried', 'pick', 'picked', 'drop', 'dropped',
+    'send', 'sent', 'receive', 'received',
+    'choose', 'chose', 'decide', 'decided', 'agree', 'agreed', 'disagree', 'disagreed',
+    'accept', 'accepted', 'refuse', 'refused', 'allow', 'allowed', 'permit', 'permitted',
+    'forbid', 'forbidden', 'force', 'forced', 'protect', 'protected',
+    'save', 'saved', 'rescue', 'rescued', 'escape', 'escaped', 'avoid', 'avoided',
+    'prevent', 'prevented', 'cause', 'caused', 'happen', 'happened', 'occur', 'occurred',
+    'exist', 'existed', 'appear', 'appeared', 'disappear', 'disappeared', 'remain', 'remained',
+    'contain', 'contained', 'include', 'included', 'involve', 'involved', 'depend', 'depended',
+    'belong', 'belonged', 'own', 'owned', 'share', 'shared', 'offer', 'offered',
+    'provide', 'provided', 'supply', 'supplied', 'deliver', 'delivered', 'serve', 'served',
+    'support', 'supported', 'manage', 'managed', 'control', 'controlled', 'handle', 'handled',
+    'deal', 'dealt', 'treat', 'treated', 'care', 'cared', 'worry', 'worried',
+    'fear', 'feared', 'surprise', 'surprised', 'shock', 'shocked', 'amaze', 'amazed',
+    'confuse', 'confused', 'explain', 'explained', 'describe', 'described', 'discuss', 'discussed',
+    'argue', 'argued', 'complain', 'complained', 'suggest', 'suggested', 'recommend', 'recommended',
+    'advise', 'advised', 'warn', 'warned', 'remind', 'reminded', 'inform', 'informed',
+    'announce', 'announced', 'declare', 'declared', 'claim', 'claimed', 'state', 'stated',
+    'mention', 'mentioned', 'report', 'reported', 'confirm', 'confirmed', 'deny', 'denied',
+    'admit', 'admitted', 'confess', 'confessed', 'lie', 'lied', 'steal', 'stole',
+    'cheat', 'cheated', 'trick', 'tricked', 'fool', 'fooled', 'joke', 'joked',
+    'laugh', 'laughed', 'smile', 'smiled', 'cry', 'cried', 'shout', 'shouted',
+    'whisper', 'whispered', 'sing', 'sang', 'dance', 'danced', 'jump', 'jumped',
+    'climb', 'climbed', 'fall', 'fell', 'fly', 'flew', 'swim', 'swam',
+    'drive', 'drove', 'ride', 'rode', 'arrive', 'arrived', 'reach', 'reached',
+    'return', 'returned', 'enter', 'entered', 'exit', 'exited', 'approach', 'approached',
+    'pass', 'passed', 'cross', 'crossed', 'chase', 'chased',
+    'search', 'searched', 'explore', 'explored', 'discover', 'discovered', 'notice', 'noticed',
+    'observe', 'observed', 'watch', 'watched', 'examine', 'examined', 'check', 'checked',
+    'test', 'tested', 'attempt', 'attempted', 'practice', 'practiced',
+    'train', 'trained', 'exercise', 'exercised', 'compete', 'competed', 'race', 'raced',
+    'game', 'games', 'sport', 'sports', 'team', 'teams',
+    'player', 'players', 'coach', 'coaches', 'fan', 'fans', 'audience', 'audiences',
+    'shows', 'movie', 'movies', 'film', 'films', 'book', 'books',
+    'story', 'stories', 'news', 'information', 'data', 'fact', 'facts',
+    'idea', 'ideas', 'thoughts', 'opinion', 'opinions', 'view', 'views',
+    'point', 'points', 'reason', 'reasons', 'causes', 'effect', 'effects',
+    'result', 'results', 'answer', 'answers', 'question', 'questions', 'problem', 'problems',
+    'solution', 'solutions', 'method', 'methods', 'way', 'ways', 'manner', 'manners',
+    'style', 'styles', 'type', 'types', 'kind', 'kinds', 'sort', 'sorts',
+    'class', 'classes', 'group', 'groups', 'member', 'members',
+    'person', 'people', 'human', 'humans', 'man', 'men', 'woman', 'women',
+    'child', 'children', 'baby', 'babies', 'boy', 'boys', 'girl', 'girls',
+    'family', 'families', 'parent', 'parents', 'mother', 'mothers', 'father', 'fathers',
+    'brother', 'brothers', 'sister', 'sisters', 'friend', 'friends', 'enemy', 'enemies',
+    'neighbor', 'neighbors', 'stranger', 'strangers', 'guest', 'guests', 'host', 'hosts',
+    'customer', 'customers', 'client', 'clients', 'boss', 'bosses', 'worker', 'workers',
+    'employee', 'employees', 'employer', 'employers', 'job', 'jobs', 'works',
+    'business', 'businesses', 'company', 'companies', 'office', 'offices', 'store', 'stores',
+    'shop', 'shops', 'market', 'markets', 'bank', 'banks', 'school', 'schools',
+    'university', 'universities', 'college', 'colleges', 'student', 'students',
+    'teacher', 'teachers', 'professor', 'professors', 'doctor', 'doctors', 'nurse', 'nurses',
+    'hospital', 'hospitals', 'medicine', 'medicines', 'health', 'healthy', 'sick', 'disease',
+    'pain', 'hurt', 'injury', 'accident', 'emergency', 'danger', 'safe', 'safety',
+    'police', 'crime', 'law', 'legal', 'court', 'judge', 'jury', 'lawyer',
+    'government', 'politics', 'president', 'minister', 'election', 'vote', 'citizen', 'country',
+    'nation', 'city', 'town', 'village', 'place', 'location', 'address',
+    'street', 'road', 'avenue', 'building', 'house', 'home', 'apartment', 'room',
+    'kitchen', 'bathroom', 'bedroom', 'living', 'garden', 'yard', 'garage', 'basement',
+    'floor', 'ceiling', 'wall', 'door', 'window', 'roof', 'stairs', 'elevator',
+    'furniture', 'table', 'chair', 'bed', 'sofa', 'desk', 'shelf', 'mirror',
+    'picture', 'painting', 'photo', 'image', 'color', 'colors', 'red', 'blue',
+    'green', 'yellow', 'orange', 'purple', 'pink', 'brown', 'black', 'white',
+    'grey', 'gray', 'light', 'dark', 'bright', 'clear', 'transparent', 'thick',
+    'thin', 'wide', 'narrow', 'long', 'short', 'tall', 'high', 'low',
+    'big', 'large', 'huge', 'giant', 'small', 'tiny', 'little', 'medium',
+    'heavy', 'strong', 'weak', 'hard', 'soft', 'smooth', 'rough',
+    'hot', 'warm', 'cool', 'cold', 'freezing', 'wet', 'dry', 'dirty',
+    'new', 'old', 'young', 'fresh', 'stale', 'good', 'bad', 'great', 'terrible',
+    'wonderful', 'amazing', 'beautiful', 'ugly', 'nice', 'pleasant', 'horrible', 'awful',
+    'perfect', 'excellent', 'outstanding', 'poor', 'rich', 'expensive', 'cheap', 'free',
+    'easy', 'difficult', 'simple', 'complex', 'complicated', 'obvious',
+    'strange', 'weird', 'normal', 'usual', 'common', 'rare', 'special', 'ordinary',
+    'important', 'serious', 'funny', 'interesting', 'boring', 'exciting', 'surprising', 'shocking',
+    'happy', 'sad', 'angry', 'mad', 'calm', 'peaceful', 'nervous',
+    'afraid', 'scared', 'brave', 'proud', 'ashamed', 'embarrassed', 'confident', 'shy',
+    'lonely', 'popular', 'famous', 'unknown', 'public', 'private', 'secret',
+    'full', 'empty', 'complete', 'incomplete', 'ready', 'busy',
+    'available', 'possible', 'impossible', 'necessary', 'optional', 'required',
+    'illegal', 'right', 'wrong', 'correct', 'incorrect',
+    'true', 'false', 'real', 'fake', 'actual', 'virtual', 'original', 'copy',
+    'first', 'second', 'third', 'last', 'final', 'next', 'previous', 'following',
+    'single', 'double', 'triple', 'multiple', 'few', 'several', 'many', 'much',
+    'more', 'most', 'less', 'least', 'enough', 'too', 'very', 'quite',
+    'rather', 'pretty', 'fairly', 'extremely', 'incredibly', 'absolutely', 'completely', 'totally',
+    'almost', 'nearly', 'about', 'approximately', 'exactly', 'precisely', 'roughly', 'generally',
+    'usually', 'normally', 'typically', 'often', 'sometimes', 'rarely', 'never', 'always',
+    'forever', 'temporary', 'permanent', 'constant', 'stable', 'changing', 'moving', 'still',
+    'active', 'passive', 'alive', 'dead', 'dying', 'growing', 'shrinking',
+    'increasing', 'decreasing', 'rising', 'falling', 'improving', 'worsening', 'developing', 'declining',
+    'successful', 'unsuccessful', 'winning', 'losing', 'leading', 'ahead', 'behind',
+    'early', 'late', 'slow', 'fast', 'quick', 'rapid', 'sudden', 'gradual',
+    'immediate', 'instant', 'delayed', 'urgent', 'priority', 'minor',
+    'major', 'main', 'primary', 'secondary', 'basic', 'advanced', 'elementary', 'fundamental',
+    'essential', 'extra', 'additional', 'spare', 'reserve', 'backup',
+    'duplicate', 'version', 'edition', 'model', 'brand',
+    'category', 'section', 'part', 'piece', 'item', 'object', 'thing', 'stuff',
+    'material', 'substance', 'element', 'component', 'ingredient', 'content', 'subject', 'topic',
+    'theme', 'issue', 'matter', 'affair', 'concern', 'interest', 'hobby',
+    'activity', 'action', 'movement', 'motion', 'behavior', 'conduct', 'attitude',
+    'technique', 'skill', 'ability', 'talent', 'gift', 'power', 'strength',
+    'weakness', 'advantage', 'disadvantage', 'benefit', 'profit', 'loss', 'gain',
+    'price', 'value', 'worth', 'quality', 'quantity', 'amount', 'number', 'figure',
+    'total', 'sum', 'average', 'minimum', 'maximum', 'limit', 'range', 'scale',
+    'level', 'degree', 'grade', 'rank', 'position', 'status', 'condition', 'situation',
+    'circumstance', 'case', 'example', 'instance', 'occasion', 'opportunity', 'chance',
+    'possibility', 'probability', 'risk', 'threat', 'warning', 'alarm', 'signal',
+    'sign', 'symbol', 'mark', 'label', 'tag', 'name', 'title', 'heading',
+    'caption', 'description', 'explanation', 'definition', 'meaning', 'sense', 'purpose', 'goal',
+    'aim', 'target', 'objective', 'plan', 'strategy', 'tactic',
+    'system', 'process', 'procedure', 'operation', 'function', 'role', 'task',
+    'duty', 'responsibility', 'obligation', 'requirement', 'rule', 'regulation', 'policy', 'principle',
+    'standard', 'norm', 'custom', 'tradition', 'culture', 'society', 'community',
+    'crowd', 'mass', 'population', 'generation', 'age', 'era',
+    'period', 'time', 'moment', 'minute', 'hour', 'day',
+    'week', 'month', 'year', 'decade', 'century', 'millennium', 'past', 'present',
+    'future', 'history', 'tale', 'account', 'record', 'document',
+    'paper', 'file', 'folder', 'magazine', 'newspaper', 'article', 'page',
+    'chapter', 'paragraph', 'sentence', 'word', 'letter', 'character',
+    'digit', 'calculation', 'mathematics', 'science', 'technology', 'computer',
+    'internet', 'website', 'email', 'message', 'communication', 'conversation', 'discussion', 'debate',
+    'argument', 'conflict', 'war', 'peace', 'agreement', 'contract',
+    'promise', 'commitment', 'decision', 'choice', 'option', 'alternative', 'selection', 'preference',
+    'belief', 'faith', 'religion', 'god', 'church', 'prayer',
+    'dream', 'nightmare', 'reality', 'truth',
+    'mystery', 'wonder', 'miracle', 'magic', 'spell',
+    'curse', 'blessing', 'luck', 'fortune', 'fate', 'destiny',
+    'prediction', 'forecast', 'weather', 'climate', 'temperature', 'season', 'spring', 'summer',
+    'autumn', 'winter', 'rain', 'snow', 'wind', 'storm', 'thunder', 'lightning',
+    'sun', 'moon', 'star', 'planet', 'earth', 'world', 'universe', 'space',
+    'nature', 'environment', 'air', 'water', 'fire', 'ground', 'soil',
+    'rock', 'stone', 'mountain', 'hill', 'valley', 'river', 'lake', 'ocean',
+    'sea', 'beach', 'forest', 'tree', 'plant', 'flower', 'grass', 'leaf',
+    'animal', 'bird', 'fish', 'dog', 'cat', 'horse', 'cow', 'pig',
+    'chicken', 'sheep', 'goat', 'rabbit', 'mouse', 'rat', 'lion', 'tiger',
+    'elephant', 'monkey', 'snake', 'spider', 'insect', 'butterfly', 'bee', 'ant',
+    'food', 'meal', 'breakfast', 'lunch', 'dinner', 'snack',
+    'milk', 'juice', 'coffee', 'tea', 'beer', 'wine', 'alcohol', 'sugar',
+    'salt', 'pepper', 'spice', 'herb', 'oil', 'butter', 'cheese', 'meat',
+    'beef', 'pork', 'egg', 'bread', 'cake', 'cookie',
+    'fruit', 'apple', 'banana', 'grape', 'strawberry', 'vegetable', 'potato',
+    'tomato', 'onion', 'carrot', 'lettuce', 'rice', 'pasta', 'pizza', 'sandwich',
+    'soup', 'salad', 'sauce', 'dish', 'plate', 'bowl', 'cup', 'glass',
+    'bottle', 'box', 'bag', 'package', 'container', 'jar', 'pot',
+    'pan', 'knife', 'fork', 'spoon', 'tool', 'equipment', 'machine', 'device',
+    'instrument', 'apparatus', 'gadget', 'appliance', 'vehicle', 'car', 'truck', 'bus',
+    'plane', 'ship', 'boat', 'bicycle', 'motorcycle', 'wheel', 'engine',
+    'motor', 'fuel', 'gas', 'electricity', 'energy', 'battery',
+    'wire', 'cable', 'rope', 'chain', 'metal', 'iron', 'steel', 'gold',
+    'silver', 'copper', 'plastic', 'rubber', 'wood', 'cloth',
+    'fabric', 'leather', 'cotton', 'wool', 'silk', 'clothes', 'clothing', 'dress',
+    'shirt', 'pants', 'skirt', 'coat', 'jacket', 'hat', 'cap', 'shoe',
+    'boot', 'sock', 'glove', 'belt', 'jewelry', 'ring', 'necklace',
+    'money', 'cash', 'coin', 'bill', 'dollar', 'cent',
+    'credit', 'debt', 'loan', 'investment', 'trade',
+    'economy', 'industry', 'factory', 'production', 'manufacturing', 'construction', 'architecture',
+    'design', 'art', 'music', 'song', 'performance', 'entertainment',
+    'competition', 'match', 'tournament', 'championship', 'victory',
+    'defeat', 'winner', 'loser', 'prize', 'reward',
+    'party', 'celebration', 'festival', 'holiday', 'vacation', 'trip', 'journey',
+    'tour', 'adventure', 'experience', 'memory', 'photograph',
+    'video', 'television', 'radio',
+    'library', 'education',
+    'lesson', 'course', 'exam', 'homework', 'assignment',
+    'score', 'achievement', 'success', 'failure', 'mistake',
+    'error', 'difficulty', 'challenge', 'obstacle', 'barrier', 'limitation', 'restriction',
+    'permission', 'approval', 'acceptance', 'rejection', 'refusal', 'denial', 'confirmation', 'verification',
+    'proof', 'evidence', 'witness', 'testimony', 'statement', 'declaration', 'announcement', 'advertisement',
+    'publicity', 'promotion', 'campaign', 'marketing', 'sales', 'purchase', 'shopping',
+    'service', 'satisfaction', 'complaint', 'criticism', 'praise', 'compliment',
+    'gratitude', 'appreciation', 'respect', 'admiration', 'affection', 'friendship', 'relationship',
+    'marriage', 'wedding', 'divorce', 'separation', 'birth', 'death', 'funeral', 'cemetery',
+    'grave', 'spirit', 'soul', 'mind', 'brain', 'imagination',
+    'creativity', 'inspiration', 'motivation', 'encouragement', 'assistance', 'aid',
+    'salvation', 'protection', 'security',
+    'attack', 'defense', 'weapon', 'gun', 'sword', 'bomb', 'explosion',
+    'smoke', 'flame', 'heat', 'burn', 'suffering', 'agony',
+    'torture', 'punishment', 'penalty', 'fine', 'prison', 'jail', 'cell', 'freedom',
+    'liberty', 'independence', 'democracy', 'republic', 'monarchy', 'dictatorship', 'tyranny', 'oppression',
+    'revolution', 'rebellion', 'protest', 'demonstration', 'strike', 'boycott', 'resistance', 'opposition',
+    'opponent', 'rival', 'competitor', 'ally', 'partner', 'colleague', 'teammate',
+    'cooperation', 'collaboration', 'partnership', 'alliance', 'union', 'organization', 'institution', 'association',
+    'club', 'crew', 'staff', 'personnel', 'workforce',
+    'laborer', 'professional', 'expert', 'specialist', 'consultant', 'advisor',
+    'manager', 'director', 'supervisor', 'leader', 'chief', 'chairman',
+    'owner', 'founder', 'creator', 'inventor', 'designer', 'architect', 'engineer', 'scientist',
+    'researcher', 'scholar', 'academic', 'intellectual', 'philosopher', 'writer', 'author', 'poet',
+    'artist', 'painter', 'musician', 'singer', 'actor', 'performer', 'celebrity',
+    'hero', 'champion', 'master', 'genius',
+    'capacity', 'capability', 'potential',
+    'certainty', 'uncertainty', 'doubt', 'confidence', 'trust', 'conviction',
+    'judgment', 'evaluation', 'assessment', 'analysis', 'examination', 'investigation', 'research',
+    'survey', 'interview', 'questionnaire', 'poll',
+    'candidate', 'politician', 'administration', 'authority', 'influence',
+    'impact', 'consequence', 'outcome', 'conclusion', 'summary',
+    'interpretation', 'translation',
+    'reproduction', 'imitation', 'forgery', 'counterfeit', 'fraud',
+    'offense', 'violation', 'breach', 'infringement', 'trespass', 'invasion', 'intrusion',
+    'interference', 'disruption', 'disturbance', 'noise', 'sound', 'voice', 'speech', 'language',
+    'term', 'phrase', 'expression', 'text',
+    'knowledge', 'wisdom',
+    'understanding', 'comprehension', 'awareness', 'consciousness', 'recognition', 'realization', 'discovery', 'invention',
+    'creation', 'innovation', 'improvement', 'development', 'progress', 'advancement', 'evolution',
+    'transformation', 'conversion', 'adaptation', 'adjustment', 'modification', 'alteration', 'revision', 'correction',
+    'maintenance', 'treatment', 'therapy',
+    'drug', 'medication', 'pill', 'tablet', 'capsule', 'injection', 'vaccine', 'surgery',
+    'program', 'project', 'scheme', 'structure', 'arrangement', 'order',
+    'sequence', 'series', 'link', 'connection', 'correlation',
+    'comparison', 'contrast', 'difference', 'similarity', 'resemblance', 'likeness', 'fit',
+    'suit', 'appropriate', 'suitable', 'proper', 'accurate', 'precise',
+    'exact', 'specific', 'particular', 'unique', 'individual', 'personal',
+    'general', 'regular', 'typical',
+    'moderate', 'reasonable', 'fair', 'just', 'equal', 'balanced',
+    'steady', 'consistent', 'lasting', 'durable',
+    'solid', 'firm', 'tight', 'secure', 'covered', 'hidden',
+    'mysterious', 'unfamiliar', 'odd', 'unusual',
+    'extraordinary', 'remarkable', 'incredible', 'unbelievable',
+    'tough', 'challenging', 'demanding', 'strict', 'severe', 'harsh', 'cruel', 'brutal',
+    'violent', 'aggressive', 'hostile', 'furious', 'crazy', 'insane',
+    'stupid', 'foolish', 'silly', 'ridiculous', 'absurd', 'nonsense', 'meaningless', 'pointless',
+    'useless', 'worthless', 'valuable', 'precious', 'costly', 'affordable',
+    'unfair', 'unjust', 'evil',
+    'disgusting', 'nasty', 'attractive',
+    'handsome', 'gorgeous', 'lovely', 'enjoyable', 'fun', 'entertaining',
+    'thrilling', 'fantastic',
+    'ideal', 'best', 'better', 'okay',
+    'alright', 'satisfactory', 'adequate', 'sufficient', 'plenty', 'lots',
+    'all', 'every', 'each', 'both', 'either',
+    'neither', 'none', 'nothing', 'nobody', 'no', 'not', 'nowhere',
+    'yes', 'yeah', 'sure', 'certainly', 'definitely',
+    'entirely', 'fully',
+    'unbelievably', 'surprisingly', 'unexpectedly', 'suddenly', 'immediately', 'instantly', 'quickly', 'rapidly',
+    'slowly', 'carefully', 'gently', 'softly', 'quietly', 'silently',
+    'loudly', 'clearly', 'obviously', 'apparently', 'evidently', 'probably', 'possibly', 'maybe',
+    'perhaps', 'surely', 'truly', 'really', 'actually', 'indeed',
+    'finally', 'eventually', 'ultimately', 'basically', 'essentially', 'fundamentally', 'primarily', 'mainly',
+    'mostly', 'commonly', 'frequently',
+    'occasionally', 'seldom', 'hardly', 'barely', 'scarcely',
+    'around', 'specifically',
+    'particularly', 'especially', 'notably', 'remarkably', 'significantly', 'considerably', 'substantially', 'greatly',
+    'highly', 'deeply', 'seriously', 'badly', 'poorly', 'well',
+    'worse', 'worst', 'also',
+    'as', 'so', 'such', 'unlike', 'similar', 'different', 'same',
+    'other', 'another', 'else', 'otherwise', 'instead',
+    'somewhat',
+    'form', 'shape', 'size', 'length', 'width', 'height', 'depth', 'weight',
+    'date',
+    'morning', 'afternoon', 'evening', 'night', 'today', 'tomorrow',
+    'yesterday', 'now', 'then', 'soon', 'before', 'after',
+    'during', 'while', 'until', 'since', 'from', 'to', 'into', 'onto',
+    'upon', 'over', 'under', 'below', 'above', 'front', 'back',
+    'side', 'top', 'bottom', 'inside', 'outside', 'between', 'among', 'through',
+    'across', 'along', 'near', 'far', 'away', 'here',
+    'there', 'everywhere', 'anywhere', 'somewhere',
+    'straight', 'forward', 'backward', 'up', 'down', 'north', 'south', 'east',
+    'west', 'center', 'middle', 'edge', 'corner', 'beginning',
+    'whole', 'bit', 'some', 'any',
+    'tons', 'dozens', 'hundreds', 'thousands', 'millions',
+    'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven',
+    'eight', 'nine', 'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen',
+    'sixteen', 'seventeen', 'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty',
+    'sixty', 'seventy', 'eighty', 'ninety', 'hundred', 'thousand', 'million', 'billion'
+})
+
+# Suffissi tipicamente italiani (-zione, -mente, -aggio, -ezza): una parola li
+# indica solo se è più lunga del suffisso stesso. "-ità" non compare perché il
+# controllo originale girava su testo traslitterato e non poteva mai scattare.
+ITALIAN_SUFFIXES: Tuple[str, ...] = ('zione', 'mente', 'aggio', 'ezza')
+
+# Articoli, preposizioni, verbi e pronomi italiani seguiti da un'altra parola,
+# applicati al testo traslitterato con unidecode (per questo le forme accentate
+# "è" e "sarà" non sono incluse: dopo la traslitterazione non comparirebbero mai)
+ITALIAN_CONSTRUCTS_RE = re.compile(
+    r'\b(?:gli|degli|della|nella|che|con|per|di|da|a|in|su|tra|fra'
+    r'|sono|siamo|ho|hai|ha|abbiamo|avete|hanno|siete'
+    r'|quello|quella|questi|queste|quelli|quelle|questo|questa)\s+\w'
+)
+
+# Nomi di lingua accettati in configurazione -> codice langdetect
+LANGUAGE_CODE_MAPPING: Dict[str, str] = {'italian': 'it', 'it': 'it'}
+
+# Parole presenti in STRICT_ENGLISH_ONLY ma di uso comune anche in italiano
+AMBIGUOUS_WORDS: FrozenSet[str] = frozenset({'no', 'ok', 'okay', 'stop', 'start', 'post', 'master', 'computer', 'internet', 'email'})
+
+
+# Pre-filtro prima di OpenAI: radici e simboli che rendono un messaggio
+# potenzialmente da moderare (spam/vendita di materiale, link e contatti,
+# truffe e investimenti, insulti e contenuti espliciti). Un messaggio che non
+# ne contiene nessuno non viene inviato all'AI. Un falso allarme costa solo una
+# richiesta in più, quindi l'elenco è volutamente ampio.
+AI_PRESCREEN_KEYWORDS: Tuple[str, ...] = (
+    # Materiale didattico, vendita e pagamenti
+    'panier', 'riassunt', 'appunt', 'material', 'dispens', 'slide', 'tesi', 'quiz',
+    'vend', 'offro', 'offert', 'prezz', 'pagament', 'pagare', 'pagat', 'costo',
+    '€', '$', 'euro', 'soldi', 'gratis', 'sconto', 'promo', 'regalo',
+    # Contatti, canali e inviti
+    'scriv', 'contatt', 'privat', 'dm', 'pm', 'whatsapp', 'telegram', 'instagram',
+    'canale', 'gruppo', 'link', 'http', 'www', 't.me', '.com', '.it', '@',
+    'iscriv', 'entra', 'clicca', 'segui', 'join', 'numero', 'cell',
+    # Guadagni, truffe e investimenti
+    'guadagn', 'trading', 'trader', 'cripto', 'crypto', 'bitcoin', 'btc', 'forex',
+    'invest', 'bonus', 'rendit', 'profitt', 'mining', 'casino', 'scommess', 'truff',
+    # Insulti, minacce e contenuti espliciti
+    'cazz', 'merd', 'stronz', 'coglion', 'fanculo', 'puttan', 'troia', 'zoccol',
+    'idiot', 'imbecill', 'cretin', 'deficient', 'scem', 'stupid', 'ritardat',
+    'bastard', 'schif', 'porc', 'dio', 'madonna', 'cristo', 'figa', 'minchia',
+    'frocio', 'negr', 'sesso', 'sex', 'porn', 'nud', 'xxx', 'ammazz', 'uccid',
+    'muori', 'crepa', 'fuck', 'shit', 'bitch',
+)
+_AI_PRESCREEN_RE = re.compile(
+    _trie_alternation(AI_PRESCREEN_KEYWORDS)
+    + r'|\d{6,}'  # numeri di telefono o codici
+)
+
+# Parole che aprono tipicamente una domanda, per stimare DOMANDA senza l'AI
+QUESTION_STARTERS: FrozenSet[str] = frozenset({
+    'chi', 'come', 'cosa', 'che', 'dove', 'quando', 'quanto', 'quanti', 'quanta', 'quante',
+    'quale', 'quali', 'perché', 'perche', 'qualcuno', 'qualcuna', 'sapete', 'sai',
+    'conoscete', 'avete', 'hai', 'posso', 'possiamo', 'si', 'serve', 'bisogna',
+    "c'è", "c'e", 'ci', 'esiste', 'esistono', 'ma',
+})
+
+# Raggruppamento delle richieste a OpenAI: i messaggi che arrivano entro
+# OPENAI_BATCH_WAIT_SECONDS dal primo vengono analizzati con una sola richiesta.
+# Valori predefiniti di openai_batch_max_size / openai_batch_wait_ms.
+OPENAI_BATCH_MAX_SIZE = 16
+OPENAI_BATCH_WAIT_SECONDS = 0.075
+
+# Modello predefinito (openai_model) e limiti di token in uscita. La lingua è
+# verificata localmente, quindi si leggono solo inappropriato e domanda: circa
+# 12 token come oggetto JSON o come "INAPPROPRIATO: NO / DOMANDA: NO" (la riga
+# LINGUA viene troncata con stop) e circa 20 per messaggio nel batch
+OPENAI_DEFAULT_MODEL = "gpt-4o-mini"
+# Messaggi più lunghi di openai_max_message_chars (predefinito) vengono inviati a
+# OpenAI ridotti a inizio e fine: lo spam è breve e i testi lunghi pesano sui token
+OPENAI_MAX_MESSAGE_CHARS = 1500
+OPENAI_TRUNCATED_EDGE_CHARS = 400
+OPENAI_MAX_TOKENS_SINGLE = 16
+OPENAI_MAX_TOKENS_PER_MESSAGE = 24
+
+OPENAI_BATCH_INSTRUCTIONS = (
+    "Riceverai più messaggi, ciascuno preceduto da 'MESSAGGIO N:'. "
+    "Analizza ogni messaggio separatamente con le regole precedenti e rispondi "
+    "SOLO con un oggetto JSON che abbia come chiavi i numeri dei messaggi "
+    "(la lingua è verificata separatamente, non indicarla), ad esempio:\n"
+    '{"1": {"inappropriato": false, "domanda": true}, '
+    '"2": {"inappropriato": true, "domanda": false}}'
+)
+
+_BATCH_INSTRUCTIONS_MESSAGE: Mapping[str, str] = MappingProxyType({"role": "system", "content": OPENAI_BATCH_INSTRUCTIONS})
+
+# Output strutturato (response_format json_schema): il modello può produrre solo
+# l'oggetto con i due campi letti dal bot, senza testo aggiuntivo da interpretare
+_VERDICT_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {"inappropriato": {"type": "boolean"}, "domanda": {"type": "boolean"}},
+    "required": ["inappropriato", "domanda"],
+    "additionalProperties": False,
+}
+OPENAI_VERDICT_RESPONSE_FORMAT: Dict[str, Any] = {
+    "type": "json_schema",
+    "json_schema": {"name": "verdetto_moderazione", "strict": True, "schema": _VERDICT_SCHEMA},
+}
+
+
+@functools.lru_cache(maxsize=32)
+def batch_verdict_response_format(size: int) -> Dict[str, Any]:
+    """
+    response_format json_schema per un batch di size messaggi: un verdetto
+    obbligatorio per ogni numero da 1 a size, così nessun messaggio resta senza esito.
+    """
+    keys = [str(index) for index in range(1, size + 1)]
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "verdetti_moderazione",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {key: _VERDICT_SCHEMA for key in keys},
+                "required": keys,
+                "additionalProperties": False,
+            },
+        },
+    }
+
+
+# Campi della risposta testuale di OpenAI (INAPPROPRIATO/DOMANDA/LINGUA), letti in un solo
+# passaggio. Tollera maiuscole/minuscole, spazi mancanti o in più, grassetto markdown e SÌ/YES.
+_OPENAI_VERDICT_RE = re.compile(
+    r"\b(INAPPROPRIATO|DOMANDA|LINGUA)[\s*_]*:[\s*_]*(S[IÌ]|YES|NO|NON[\s_]*CONSENTITA|CONSENTITA)\b",
+    re.IGNORECASE,
+)
+_VERDICT_YES: FrozenSet[str] = frozenset({"SI", "SÌ", "YES"})
+
+
+def parse_openai_verdict(result_text: str) -> Optional[Tuple[bool, bool, bool]]:
+    """
+    Restituisce (inappropriato, domanda, lingua_non_consentita) dalla risposta testuale
+    di OpenAI, oppure None se la risposta non contiene il campo INAPPROPRIATO.
+    """
+    fields = {name.upper(): value.upper() for name, value in _OPENAI_VERDICT_RE.findall(result_text)}
+    if "INAPPROPRIATO" not in fields:
+        return None
+    return (
+        fields["INAPPROPRIATO"] in _VERDICT_YES,
+        fields.get("DOMANDA") in _VERDICT_YES,
+        fields.get("LINGUA", "").startswith("NON"),
+    )
+
+
+def _json_flag(value: Any) -> bool:
+    """Interpreta un valore booleano della risposta JSON (true/false o SI/NO)."""
+    if isinstance(value, str):
+        return value.strip().upper() in ("SI", "SÌ", "TRUE", "YES")
+    return value is True
+
+
+# Attesa dopo un errore 429 se la risposta non indica quando riprovare
+OPENAI_RATE_LIMIT_DEFAULT_PAUSE_SECONDS = 5.0
+# Durate delle intestazioni x-ratelimit-reset-* (es. "1s", "6m0s", "20ms")
+_RATE_LIMIT_DURATION_RE = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNIT_SECONDS: Dict[str, float] = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+def rate_limit_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Secondi da attendere dopo un errore 429, letti da retry-after-ms o retry-after.
+    Solo se mancano si usano x-ratelimit-reset-requests/-tokens, che indicano il
+    ripristino dell'intera quota: del limite esaurito (remaining a 0) o, se non
+    indicato, il più breve. None se assenti.
+    """
+    for header, scale in (('retry-after-ms', 0.001), ('retry-after', 1.0)):
+        try:
+            if headers.get(header):
+                return float(headers[header]) * scale
+        except ValueError:
+            pass
+    resets: Dict[str, float] = {}
+    for limit in ('requests', 'tokens'):
+        value = headers.get(f'x-ratelimit-reset-{limit}')
+        if value:
+            resets[limit] = sum(float(amount) * _DURATION_UNIT_SECONDS[unit]
+                                for amount, unit in _RATE_LIMIT_DURATION_RE.findall(value))
+    exhausted = [wait for limit, wait in resets.items() if headers.get(f'x-ratelimit-remaining-{limit}') == '0']
+    waits = exhausted or list(resets.values())
+    return min(waits) if waits else None
+
+
+class _RequestRateLimiter:
+    """
+    Token bucket per le richieste a OpenAI: al massimo requests_per_minute richieste
+    al minuto, con raffiche fino allo stesso numero. Va usato da un solo event loop
+    (nessun await tra controllo e consumo del gettone, quindi niente lock).
+    """
+    def __init__(self, requests_per_minute: float):
+        self.capacity = requests_per_minute
+        self.tokens = requests_per_minute
+        self.refill_per_second = requests_per_minute / 60
+        self.updated_at = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.refill_per_second)
+
+
+class ModerationStats:
+    """Contatori dell'analisi dei messaggi (attributi a slot fissi, niente dict per istanza)."""
+    __slots__ = (
+        'total_messages_analyzed_by_openai',
+        'direct_filter_matches',
+        'ai_filter_violations',
+        'openai_requests',
+        'openai_cache_hits',
+        'openai_truncated_messages',
+    )
+
+    def __init__(self):
+        for field in self.__slots__:
+            setattr(self, field, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class AdvancedModerationBotLogic:
     def __init__(self, config_manager: ConfigManager, logger: logging.Logger):
         self.config_manager = config_manager
         self.logger = logger
-        self.banned_words: List[str] = self.config_manager.get('banned_words', [])
-        self.whitelist_words: List[str] = self.config_manager.get('whitelist_words', [])
-        self.allowed_languages: List[str] = self.config_manager.get('allowed_languages', ["italian"])
+        self.banned_words = self.config_manager.get('banned_words', [])
+        self.whitelist_words = self.config_manager.get('whitelist_words', [])
+        self.allowed_languages = self.config_manager.get('allowed_languages', ["italian"])
         self.logger.info(f"Whitelist caricata con {len(self.whitelist_words)} parole: {self.whitelist_words}")
-        self.char_map: Dict[str, str] = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t"}
-        self.analysis_cache = MessageAnalysisCache(cache_size=1000)
-        self.stats: Dict[str, Any] = {
-            'total_messages_analyzed_by_openai': 0,
-            'direct_filter_matches': 0,
-            'ai_filter_violations': 0,
-            'openai_requests': 0,
-            'openai_cache_hits': 0,
-        }
+        self.char_map = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t"}
+        self.analysis_cache = MessageAnalysisCache(
+            cache_size=self.config_manager.get('openai_cache_size', 1000),
+            ttl_seconds=self.config_manager.get('openai_cache_ttl_seconds', 3600),
+            db_path=self.config_manager.get('openai_cache_db_path')
+        )
+        self.stats = ModerationStats()
         api_key = os.getenv("OPENAI_API_KEY")
         if api_key:
-            self.openai_client = OpenAI(api_key=api_key)
-            self.logger.info("Client OpenAI inizializzato.")
+            # Pochi tentativi automatici: in caso di errore si ripiega sui filtri locali
+            max_retries = self.config_manager.get('openai_max_retries', 1)
+            # openai_base_url permette di usare un endpoint compatibile (es. vLLM o Ollama
+            # in locale); se assente il client usa OPENAI_BASE_URL o l'API di OpenAI
+            base_url = self.config_manager.get('openai_base_url') or None
+            self.openai_client = OpenAI(api_key=api_key, base_url=base_url, max_retries=max_retries)
+            self._async_openai_client_kwargs = dict(api_key=api_key, base_url=base_url, max_retries=max_retries)
+            # Client asincrono per il bot: le richieste restano in volo senza occupare thread
+            self.async_openai_client = self._build_async_openai_client()
+            self.logger.info(f"Client OpenAI inizializzato (endpoint: {self.openai_client.base_url}).")
         else:
             self.openai_client = None
+            self.async_openai_client = None
             self.logger.warning("OPENAI_API_KEY non trovato. L'analisi AI non sarà disponibile.")       
         self.prompt_manager = SystemPromptManager(logger, self)
+        self._system_message_cache: Optional[Mapping[str, str]] = None
+        self._system_message_source: Optional[Tuple[str, Tuple[str, ...], str]] = None
+        self._batch_queue: Optional[asyncio.Queue] = None
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._inflight_analyses: Dict[str, asyncio.Future] = {}
+        self._openai_semaphore: Optional[asyncio.Semaphore] = None
+        self.openai_timeout: float = self.config_manager.get('openai_timeout_seconds', 6.0)
+        self.openai_model: str = self.config_manager.get('openai_model', OPENAI_DEFAULT_MODEL)
+        # Modello per cui l'endpoint ha rifiutato l'output strutturato (si usa il formato testuale)
+        self._structured_output_unsupported_model: Optional[str] = None
+        self._openai_consecutive_failures = 0
+        self._openai_circuit_open_until = 0.0
+        # Pausa dopo un 429, separata dal circuito: una risposta riuscita non la annulla
+        self._rate_limited_until = 0.0
+        # Limite di richieste al minuto dell'account OpenAI (0: nessun limite locale)
+        requests_per_minute = self.config_manager.get('openai_requests_per_minute', 0)
+        if 0 < requests_per_minute < 1:
+            # Il token bucket non arriverebbe mai a un gettone intero
+            self.logger.warning(f"openai_requests_per_minute non valido ({requests_per_minute}): minimo 1, limite locale disattivato.")
+            requests_per_minute = 0
+        self._openai_rate_limiter = _RequestRateLimiter(requests_per_minute) if requests_per_minute > 0 else None
+
+    @property
+    def banned_words(self) -> List[str]:
+        return self._banned_words
+
+    @banned_words.setter
+    def banned_words(self, words: List[str]):
+        """
+        Imposta le parole bannate e ricompila la regex a parola intera usata dal
+        filtro diretto (anche quando la configurazione viene ricaricata).
+        """
+        self._banned_words: List[str] = words
+        self._banned_words_by_lower: Dict[str, str] = {}
+        for word in words:
+            word_lower = word.lower().strip()
+            if word_lower:
+                self._banned_words_by_lower.setdefault(word_lower, word)
+        if self._banned_words_by_lower:
+            self._banned_words_re: Optional[re.Pattern] = re.compile(
+                r'(?<!\w)(?:' + _trie_alternation(self._banned_words_by_lower) + r')(?!\w)'
+            )
+        else:
+            self._banned_words_re = None
+        # Gli esiti memorizzati si riferiscono alla lista precedente
+        AdvancedModerationBotLogic.contains_banned_word.cache_clear(self)
+
+    @property
+    def allowed_languages(self) -> List[str]:
+        return self._allowed_languages
+
+    @allowed_languages.setter
+    def allowed_languages(self, languages: List[str]):
+        """Imposta le lingue consentite e i relativi codici ISO usati da is_language_disallowed."""
+        self._allowed_languages: List[str] = languages
+        self._any_language_allowed = not languages or "any" in languages
+        self._allowed_language_codes: FrozenSet[str] = frozenset(
+            LANGUAGE_CODE_MAPPING.get(lang.lower(), lang.lower()) for lang in languages
+        )
+        # Gli esiti memorizzati si riferiscono alle lingue precedenti
+        AdvancedModerationBotLogic.is_language_disallowed.cache_clear(self)
+
+    @property
+    def char_map(self) -> Dict[str, str]:
+        return self._char_map
+
+    @char_map.setter
+    def char_map(self, mapping: Dict[str, str]):
+        """Imposta le sostituzioni cifra -> lettera e la tabella per str.translate usata da normalize_text."""
+        self._char_map: Dict[str, str] = mapping
+        # Un'unica tabella per eliminare i caratteri non alfanumerici e applicare la mappa:
+        # le sostituzioni di caratteri già eliminati non si applicano, come in precedenza
+        self._normalize_table = {
+            **_NON_ALNUM_DELETE_TABLE,
+            **{key: value for key, value in str.maketrans(mapping).items() if key not in _NON_ALNUM_DELETE_TABLE},
+        }
+        # Cambia il testo normalizzato e quindi tutti gli esiti dei filtri locali
+        self.clear_caches()
+
+    @property
+    def whitelist_words(self) -> List[str]:
+        return self._whitelist_words
+
+    @whitelist_words.setter
+    def whitelist_words(self, words: List[str]):
+        """Imposta la whitelist e ricompila l'alternanza (sottostringhe) usata per il confronto."""
+        self._whitelist_words: List[str] = words
+        self._whitelist_words_by_lower: Dict[str, str] = {}
+        for word in words:
+            word_lower = word.lower().strip()
+            if word_lower:
+                self._whitelist_words_by_lower.setdefault(word_lower, word)
+        if self._whitelist_words_by_lower:
+            self._whitelist_words_re: Optional[re.Pattern] = re.compile(
+                _trie_alternation(self._whitelist_words_by_lower)
+            )
+        else:
+            self._whitelist_words_re = None
+        AdvancedModerationBotLogic.contains_whitelist_word.cache_clear(self)
 
-    @functools.lru_cache(maxsize=200)
+    def clear_caches(self):
+        """Svuota gli esiti memorizzati dei filtri locali (es. dopo un ricaricamento della configurazione)."""
+        for cached_method in (AdvancedModerationBotLogic.normalize_text,
+                              AdvancedModerationBotLogic.contains_whitelist_word,
+                              AdvancedModerationBotLogic.contains_banned_word,
+                              AdvancedModerationBotLogic.detect_language,
+                              AdvancedModerationBotLogic.is_language_disallowed):
+            cached_method.cache_clear(self)
+
+    @text_lru_cache(maxsize=200)
     def contains_whitelist_word(self, text: str) -> bool:
         if not self.whitelist_words:
             return False
         normalized_text = self.normalize_text(text)
         if not normalized_text:
             return False
-        for whitelist_word in self.whitelist_words:
-            normalized_whitelist_word = whitelist_word.lower().strip()
-            if normalized_whitelist_word in normalized_text:
+        whitelist_match = self._whitelist_words_re.search(normalized_text) if self._whitelist_words_re else None
+        if whitelist_match:
+            whitelist_word = self._whitelist_words_by_lower[whitelist_match.group(0)]
+            if self.logger.isEnabledFor(logging.DEBUG):
                 self.logger.debug(f"Whitelist match: '{whitelist_word}' trovata in '{text[:50]}...'")
-                return True
+            return True
         return False
 
     def get_stats(self) -> Dict[str, Any]:
-        total_analyzed = self.stats['total_messages_analyzed_by_openai']
-        cache_hits = self.stats['openai_cache_hits']
         return {
-            **self.stats,
-            'cache_size': len(self.analysis_cache.cache),
-            'cache_hit_rate': (cache_hits / total_analyzed) if total_analyzed > 0 else 0,
+            **self.stats.as_dict(),
+            'cache_size': len(self.analysis_cache),
+            'cache_hit_rate': self.stats.openai_cache_hits / max(1, self.stats.total_messages_analyzed_by_openai),
         }
 
+    @text_lru_cache(maxsize=2048)
     def normalize_text(self, text: str) -> str:
-        text = re.sub(r'\*\*(.*?)\*\*', r'', text)
-        text = re.sub(r'__(.*?)__', r'', text)
-        text = re.sub(r'~~(.*?)~~', r'', text)
-        text = re.sub(r'`(.*?)`', r'', text)
-        text = re.sub(r'\[(.*?)\]\(.*?\)', r'', text)
-        emoji_pattern = re.compile(
-            "["
-            u"😀-🙏"
-            u"🌀-🗿"
-            u"🚀-🛿"
-            u"🇠-🇿"
-            u"✂-➰"
-            u"Ⓜ-🉑"
-            u"☀-⛿"
-            u"✀-➿"
-            u"🔴🔵⚪⚫🟠🟡🟢🟣⚽⚾🥎🏀🏐🏈🏉🎱🪀🏓⚠️🚨🚫⛔️🆘🔔🔊📢📣"
-            "]+", flags=re.UNICODE)
-        text = emoji_pattern.sub('', text)
-        text = unidecode.unidecode(text.lower())
-        text = re.sub(r"[^a-z0-9\s@]", "", text)
-        for char_from, char_to in self.char_map.items():
-            text = text.replace(char_from, char_to)
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
-
-    @functools.lru_cache(maxsize=500)
+        # Sui messaggi senza marcatori markdown né emoji si evitano i passaggi inutili
+        if '**' in text or '__' in text or '~~' in text or '`' in text or '[' in text:
+            text = _MARKDOWN_RE.sub('', text)
+        if not text.isascii():
+            text = text.translate(_EMOJI_DELETE_TABLE)
+        text = text.lower()
+        if not text.isascii():
+            text = _transliterate(text)
+        text = text.translate(self._normalize_table)
+        # split() senza argomenti compatta gli spazi e rimuove quelli agli estremi
+        return ' '.join(text.split())
+
+    @text_lru_cache(maxsize=500)
     def contains_banned_word(self, text: str) -> bool:
         if not text or not text.strip():
             return False
-        self.logger.debug(f"Filtro diretto - Testo originale: '{text}'")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Filtro diretto - Testo originale: '{text}'")
         text_lower = text.lower()
-        for banned_word in self.banned_words:
-            banned_word_lower = banned_word.lower().strip()
-            if banned_word_lower in text_lower:
-                self.logger.info(f"MATCH filtro diretto: parola bannata '{banned_word}' trovata in '{text[:50]}...'")
-                return True
-        telegram_link_patterns = [
-            r'(?:https?://)?(?:t\.me|telegram\.me)/\w+',
-            r'@\w+',
-        ]
-        material_offer_words = [
-            'panieri', 'riassunti', 'appunti', 'materiale', 'slides', 'dispense',
-            'tesi', 'esami', 'soluzioni', 'quiz', 'test', 'simulazioni'
-        ]
-        invitation_words = [
-            'iscriversi', 'iscrivetevi', 'entrate', 'joinare', 'accedere', 'accesso',
-            'canale', 'gruppo', 'link', 'qui', 'sotto', 'sopra', 'clicca', 'segui'
-        ]
-        has_telegram_link = any(re.search(pattern, text_lower, re.IGNORECASE) for pattern in telegram_link_patterns)
-        has_material_offer = any(word in text_lower for word in material_offer_words)
-        has_invitation = any(word in text_lower for word in invitation_words)
+        banned_match = self._banned_words_re.search(text_lower) if self._banned_words_re else None
+        if banned_match:
+            banned_word = self._banned_words_by_lower[banned_match.group(0)]
+            self.logger.info(f"MATCH filtro diretto: parola bannata '{banned_word}' trovata in '{text[:50]}...'")
+            return True
+        has_telegram_link = self.has_telegram_link(text_lower) or _MENTION_RE.search(text_lower) is not None
+        has_material_offer = _MATERIAL_OFFER_RE.search(text_lower) is not None
+        has_invitation = _INVITATION_RE.search(text_lower) is not None
         if has_telegram_link and has_material_offer and has_invitation:
             self.logger.info(f"MATCH filtro diretto: link Telegram + offerta materiale + invito in '{text[:50]}...'")
             return True
         normalized_text = self.normalize_text(text)
         if not normalized_text:
             return False
-        self.logger.debug(f"Filtro diretto - Testo normalizzato: '{normalized_text}'")
-        cyrillic_count = sum(1 for char in text if 'Ѐ' <= char <= 'ӿ' or 'Ԁ' <= char <= 'ԯ')
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Filtro diretto - Testo normalizzato: '{normalized_text}'")
+        # Un testo ASCII non può contenere caratteri cirillici
+        cyrillic_count = 0 if text.isascii() else len(_CYRILLIC_RE.findall(text))
         if cyrillic_count >= 3:
             self.logger.info(f"MATCH filtro diretto: {cyrillic_count} caratteri cirillici in '{text[:50]}...'")
             return True
-        masked_panieri_spam_patterns = [
-            r"chi\s+cerc[ao]\s+panier.*(?:scriv|contatt|privat)",
-            r"cerc[ao]\s+panier.*(?:scriv|contatt|privat)",
-            r"ho\s+(?:material|panier).*(?:scriv|contatt|privat)",
-            r"(?:material|panier).*(?:complet|aggiornat).*(?:scriv|contatt|privat)",
-            r"panier.*disponibil.*(?:scriv|contatt|privat|interessat)",
-            r"panier.*(?:2024|2025|aggiornat).*(?:scriv|contatt|privat|interessat)",
-            r"(?:scriv|contatt).*(?:per|sui)\s+panier",
-            r"panier.*(?:scriv|contatt).*(?:privat|dm)",
-            r"material.*(?:scriv|contatt).*(?:privat|dm)",
-            r"interessat.*(?:scriv|contatt)",
-            r"(?:scriv|contatt).*(?:per|chi)\s+(?:material|panier|appunt)",
-            r"(?:material|panier).*(?:chi|per).*(?:scriv|contatt)",
-            r"vendita.*(?:panier|riassunt|material).*(?:t\.me|telegram|canale)",
-            r"(?:panier|riassunt|material).*vendita.*(?:t\.me|telegram|canale)",
-            r"affidatevi.*(?:unico|solo).*canale.*(?:panier|riassunt|material)",
-            r"canale.*(?:ufficiale|preposto).*(?:vendita|offerta).*(?:panier|riassunt)",
-            r"@panieriunipegasomercatorum",
-            r"@unitelematica",
-        ]
-        for pattern in masked_panieri_spam_patterns:
-            if re.search(pattern, normalized_text, re.IGNORECASE):
-                self.logger.info(f"MATCH filtro diretto (spam mascherato): pattern '{pattern}' in '{text}'")
-                return True
-        obvious_spam_patterns = [
-            r"(?:vendo|offro).*[0-9]+\s*(?:euro|€).*(?:scriv|contatt|privat|whatsapp|telegram)",
-            r"guadagni?\s+(?:facili|garantiti|sicuri)",
-            r"(?:soldi|euro)\s+facili",
-            r"mining.*pool.*(?:join|entra)",
-            r"zarabotok",
-            r"rabota",
-            r"pishi",
-            r"kontakt",
-        ]
-        for pattern in obvious_spam_patterns:
-            if re.search(pattern, normalized_text, re.IGNORECASE):
-                self.logger.info(f"MATCH filtro diretto: pattern '{pattern}' in '{normalized_text}'")
-                return True
+        spam_match = _SPAM_PATTERNS_RE.search(normalized_text)
+        if spam_match:
+            kind, pattern = _SPAM_PATTERN_SOURCES[spam_match.lastindex - 1]
+            self.logger.info(f"MATCH filtro diretto ({kind}): pattern '{pattern}' in '{normalized_text}'")
+            return True
         return False
 
     def contains_suspicious_contact_invitation(self, text: str) -> bool:
         normalized_text = self.normalize_text(text)
         if not normalized_text: return False
-        legitimate_contexts = [
-            "grupp\w+\s+(?:studio|whatsapp|telegram)", "aggiung\w+\s+gruppo",
-            "link\s+gruppo", "mandat\w+\s+numer\w+", "entrare\s+nel\s+gruppo"
-        ]
-        for legit_pattern in legitimate_contexts:
-            if re.search(legit_pattern, normalized_text):
-                if not any(term in normalized_text for term in ["vendo", "offro", "prezzo", "pagamento", "€", "euro"]):
+        signals = _CONTACT_SIGNALS_RE.match(normalized_text)
+        if signals.group('legit'):
+            if not _COMMERCIAL_TERMS_RE.search(normalized_text):
+                if self.logger.isEnabledFor(logging.DEBUG):
                     self.logger.debug(f"Invito al contatto in contesto legittimo: '{normalized_text}'")
-                    return False
-        contact_channels = ["whatsapp", "telegram", "instagram", "dm", "direct", "privato", "@\w+"]
-        contact_actions = ["scriv\w+", "contatt\w+", "mand\w+", "invia\w+", "messaggi\w+"]
-        offered_items = [
-            "panier\w+", "appunt\w+", "material\w+", "tesi", "esami", "soluzion\w+",
-            "aiuto", "lezioni", "slides", "aggiornat\w+"
-        ]
-        has_contact_channel = any(re.search(channel, normalized_text) for channel in contact_channels)
-        has_contact_action = any(action in normalized_text for action in contact_actions)
-        has_offered_item = any(item in normalized_text for item in offered_items)
+                return False
+        has_contact_channel = signals.group('channel') is not None
+        has_contact_action = signals.group('action') is not None
+        has_offered_item = signals.group('item') is not None
         if (has_contact_channel or has_contact_action) and has_offered_item:
-            self.logger.debug(f"Rilevato invito al contatto sospetto: '{normalized_text}'")
-            return True
-        if re.search(r"@\w+", normalized_text) and has_offered_item:
-            self.logger.debug(f"Rilevato @username con offerta materiale: '{normalized_text}'")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Rilevato invito al contatto sospetto: '{normalized_text}'")
             return True
         return False
         
+    @text_lru_cache(maxsize=1024)
     def detect_language(self, text: str) -> Optional[str]:
-        if not LANGDETECT_AVAILABLE or not text or len(text.strip()) < 5:
+        if not (CLD3_AVAILABLE or LANGDETECT_AVAILABLE) or not text or len(text.strip()) < 5:
             return None 
+        if CLD3_AVAILABLE:
+            prediction = cld3.get_language(text)
+            if prediction is not None and prediction.is_reliable:
+                return prediction.language
+            if not LANGDETECT_AVAILABLE:
+                return None
         try:
             detected_langs = langdetect.detect_langs(text)
             if detected_langs:
@@ -212,593 +1151,105 @@ class AdvancedModerationBotLogic:
             self.logger.warning(f"Langdetect non è riuscito a rilevare la lingua per: '{text[:50]}...'")
             return None
 
+    @text_lru_cache(maxsize=1024)
     def is_language_disallowed(self, text: str) -> bool:
         """
         Determina se un testo è in una lingua non consentita.
         VERSIONE CORRETTA - Risolve i falsi positivi per frasi italiane comuni.
+        L'esito è memorizzato per testo: il bot verifica la lingua prima
+        dell'analisi AI, che lo riusa senza ricalcolarlo.
         """
-        if not self.allowed_languages or "any" in self.allowed_languages:
+        if self._any_language_allowed:
             return False
         
         clean_text = text.strip()
         if not clean_text:
             return False
         
-        self.logger.debug(f"ℹ️ ANALISI LINGUA per: '{clean_text[:100]}...'")
-        
-        # AMPLIAMENTO SIGNIFICATIVO degli indicatori italiani
-        italian_indicators = {
-            # Articoli, preposizioni, congiunzioni (molto comuni)
-            'il', 'la', 'lo', 'le', 'gli', 'i', 'un', 'una', 'uno',
-            'del', 'della', 'dello', 'delle', 'degli', 'dei',
-            'nel', 'nella', 'nello', 'nelle', 'negli', 'nei',
-            'dal', 'dalla', 'dallo', 'dalle', 'dagli', 'dai',
-            'al', 'alla', 'allo', 'alle', 'agli', 'ai',
-            'sul', 'sulla', 'sullo', 'sulle', 'sugli', 'sui',
-            'con', 'per', 'tra', 'fra', 'di', 'da', 'in', 'a', 'su',
-            'che', 'chi', 'cui', 'quale', 'quanto', 'dove', 'quando', 'come', 'perché',
-            'e', 'ed', 'o', 'od', 'ma', 'però', 'tuttavia', 'quindi', 'allora', 'infatti',
-            
-            # Pronomi comuni
-            'io', 'tu', 'lui', 'lei', 'noi', 'voi', 'loro',
-            'mi', 'ti', 'ci', 'vi', 'si', 'lo', 'la', 'li', 'le', 'ne',
-            'me', 'te', 'se', 'lui', 'lei', 'noi', 'voi', 'loro',
-            'questo', 'questa', 'questi', 'queste', 'quello', 'quella', 'quelli', 'quelle',
-            
-            # Verbi essere/avere (essenziali)
-            'è', 'sono', 'sei', 'siamo', 'siete', 'era', 'ero', 'eri', 'erano', 'eravamo', 'eravate',
-            'sarà', 'sarò', 'sarai', 'saremo', 'sarete', 'saranno', 'sia', 'siano', 'fosse', 'fossero',
-            'ho', 'hai', 'ha', 'abbiamo', 'avete', 'hanno', 'aveva', 'avevo', 'avevi', 'avevamo', 'avevate', 'avevano',
-            
-            # Verbi comuni
-            'fai', 'faccio', 'fa', 'fanno', 'fare', 'fatto', 'fatta', 'fatti', 'fatte',
-            'vai', 'vado', 'va', 'vanno', 'andare', 'andato', 'andata', 'andati', 'andate',
-            'dai', 'do', 'da', 'danno', 'dare', 'dato', 'data', 'dati', 'date',
-            'dici', 'dico', 'dice', 'dicono', 'dire', 'detto', 'detta', 'detti', 'dette',
-            'vedi', 'vedo', 'vede', 'vedono', 'vedere', 'visto', 'vista', 'visti', 'viste',
-            'senti', 'sento', 'sente', 'sentono', 'sentire', 'sentito', 'sentita', 'sentiti', 'sentite',
-            'vengo', 'vieni', 'viene', 'veniamo', 'venite', 'vengono', 'venire', 'venuto', 'venuta',
-            'posso', 'puoi', 'può', 'possiamo', 'potete', 'possono', 'potere', 'potuto', 'potuta',
-            'voglio', 'vuoi', 'vuole', 'vogliamo', 'volete', 'vogliono', 'volere', 'voluto', 'voluta',
-            'devo', 'devi', 'deve', 'dobbiamo', 'dovete', 'devono', 'dovere', 'dovuto', 'dovuta',
-            
-            # Parole di uso quotidiano
-            'ciao', 'buongiorno', 'buonasera', 'buonanotte', 'salve', 'arrivederci',
-            'grazie', 'prego', 'scusa', 'scusate', 'perfetto', 'bene', 'male', 'così',
-            'si', 'sì', 'no', 'ok', 'okay', 'boh', 'mah', 'beh', 'allora',
-            'oggi', 'ieri', 'domani', 'ora', 'adesso', 'sempre', 'mai', 'già', 'ancora',
-            'molto', 'poco', 'tanto', 'troppo', 'più', 'meno', 'tutto', 'niente', 'nulla',
-            'anche', 'solo', 'proprio', 'davvero', 'veramente', 'sicuramente', 'forse', 'magari',
-            
-            # AGGIUNTE SPECIFICHE per i casi problematici
-            'gestione', 'periodo', 'estenderanno', 'oscena', 'questa', 'quella',
-            'momento', 'situazione', 'problema', 'soluzione', 'informazione', 'comunicazione',
-            'decisione', 'discussione', 'questione', 'posizione', 'condizione', 'attenzione',
-            'direzione', 'protezione', 'produzione', 'costruzione', 'istruzione', 'educazione',
-            
-            # Ambito universitario
-            'università', 'professore', 'prof', 'crediti', 'corso', 'corsi', 'esame', 'esami',
-            'laurea', 'triennale', 'magistrale', 'dottorato', 'facoltà', 'appunti', 'paniere', 'panieri',
-            'lezioni', 'tesi', 'sessione', 'matricola', 'ateneo', 'dipartimento', 'cattedra',
-            'semestre', 'frequenza', 'iscrizione', 'slides', 'slide', 'docente', 'studente',
-            'voti', 'voto', 'votazione', 'valutazione', 'risultato', 'risultati',
-            
-            # Forme verbali comuni che potrebbero essere confuse
-            'resta', 'restano', 'restare', 'rimanere', 'rimane', 'rimangono',
-            'passa', 'passano', 'passare', 'passato', 'passata', 'passati', 'passate',
-            'prende', 'prendono', 'prendere', 'preso', 'presa', 'presi', 'prese',
-            'mette', 'mettono', 'mettere', 'messo', 'messa', 'messi', 'messe',
-            'porta', 'portano', 'portare', 'portato', 'portata', 'portati', 'portate',
-            'trova', 'trovano', 'trovare', 'trovato', 'trovata', 'trovati', 'trovate',
-            'cerca', 'cercano', 'cercare', 'cercato', 'cercata', 'cercati', 'cercate',
-            'chiede', 'chiedono', 'chiedere', 'chiesto', 'chiesta', 'chiesti', 'chieste',
-            'risponde', 'rispondono', 'rispondere', 'risposto', 'risposta', 'risposti', 'risposte',
-            'serve', 'servono', 'servire', 'servito', 'servita', 'serviti', 'servite',
-            'aiuta', 'aiutano', 'aiutare', 'aiutato', 'aiutata', 'aiutati', 'aiutate',
-            'funziona', 'funzionano', 'funzionare', 'funzionato', 'funzionata',
-            'cambia', 'cambiano', 'cambiare', 'cambiato', 'cambiata', 'cambiati', 'cambiate',
-            'aspetta', 'aspettano', 'aspettare', 'aspettato', 'aspettata', 'aspettati', 'aspettate',
-            'finisce', 'finiscono', 'finire', 'finito', 'finita', 'finiti', 'finite',
-            'inizia', 'iniziano', 'iniziare', 'iniziato', 'iniziata', 'iniziati', 'iniziate',
-            'continua', 'continuano', 'continuare', 'continuato', 'continuata',
-            'smette', 'smettono', 'smettere', 'smesso', 'smessa', 'smessi', 'smesse',
-            'cresce', 'crescono', 'crescere', 'cresciuto', 'cresciuta', 'cresciuti', 'cresciute',
-            'scende', 'scendono', 'scendere', 'sceso', 'scesa', 'scesi', 'scese',
-            'sale', 'salgono', 'salire', 'salito', 'salita', 'saliti', 'salite',
-            'esce', 'escono', 'uscire', 'uscito', 'uscita', 'usciti', 'uscite',
-            'entra', 'entrano', 'entrare', 'entrato', 'entrata', 'entrati', 'entrate',
-            'parte', 'partono', 'partire', 'partito', 'partita', 'partiti', 'partite',
-            'torna', 'tornano', 'tornare', 'tornato', 'tornata', 'tornati', 'tornate',
-            'arriva', 'arrivano', 'arrivare', 'arrivato', 'arrivata', 'arrivati', 'arrivate',
-            
-            # Avverbi e aggettivi comuni
-            'nuovo', 'nuova', 'nuovi', 'nuove', 'vecchio', 'vecchia', 'vecchi', 'vecchie',
-            'grande', 'grandi', 'piccolo', 'piccola', 'piccoli', 'piccole',
-            'bello', 'bella', 'belli', 'belle', 'brutto', 'brutta', 'brutti', 'brutte',
-            'buono', 'buona', 'buoni', 'buone', 'cattivo', 'cattiva', 'cattivi', 'cattive',
-            'primo', 'prima', 'primi', 'prime', 'ultimo', 'ultima', 'ultimi', 'ultime',
-            'stesso', 'stessa', 'stessi', 'stesse', 'altro', 'altra', 'altri', 'altre',
-            'importante', 'importanti', 'interessante', 'interessanti', 'difficile', 'difficili',
-            'facile', 'facili', 'possibile', 'possibili', 'impossibile', 'impossibili',
-            'necessario', 'necessaria', 'necessari', 'necessarie', 'libero', 'libera', 'liberi', 'libere',
-            'aperto', 'aperta', 'aperti', 'aperte', 'chiuso', 'chiusa', 'chiusi', 'chiuse',
-            'pieno', 'piena', 'pieni', 'piene', 'vuoto', 'vuota', 'vuoti', 'vuote',
-            'alto', 'alta', 'alti', 'alte', 'basso', 'bassa', 'bassi', 'basse',
-            'lungo', 'lunga', 'lunghi', 'lunghe', 'corto', 'corta', 'corti', 'corte',
-            'largo', 'larga', 'larghi', 'larghe', 'stretto', 'stretta', 'stretti', 'strette',
-            'giovane', 'giovani', 'vecchio', 'vecchia', 'vecchi', 'vecchie',
-            'ricco', 'ricca', 'ricchi', 'ricche', 'povero', 'povera', 'poveri', 'povere',
-            'felice', 'felici', 'triste', 'tristi', 'contento', 'contenta', 'contenti', 'contente',
-            'sicuro', 'sicura', 'sicuri', 'sicure', 'incerto', 'incerta', 'incerti', 'incerte',
-            'pronto', 'pronta', 'pronti', 'pronte', 'lento', 'lenta', 'lenti', 'lente',
-            'veloce', 'veloci', 'rapido', 'rapida', 'rapidi', 'rapide',
-            'calmo', 'calma', 'calmi', 'calme', 'nervoso', 'nervosa', 'nervosi', 'nervose',
-            'tranquillo', 'tranquilla', 'tranquilli', 'tranquille', 'agitato', 'agitata', 'agitati', 'agitate',
-            'normale', 'normali', 'strano', 'strana', 'strani', 'strane',
-            'giusto', 'giusta', 'giusti', 'giuste', 'sbagliato', 'sbagliata', 'sbagliati', 'sbagliate',
-            'vero', 'vera', 'veri', 'vere', 'falso', 'falsa', 'falsi', 'false',
-            'serio', 'seria', 'seri', 'serie', 'scherzoso', 'scherzosa', 'scherzosi', 'scherzose',
-            'pubblico', 'pubblica', 'pubblici', 'pubbliche', 'privato', 'privata', 'privati', 'private',
-            'sociale', 'sociali', 'personale', 'personali', 'generale', 'generali', 'particolare', 'particolari',
-            'nazionale', 'nazionali', 'internazionale', 'internazionali', 'locale', 'locali', 'regionale', 'regionali',
-            
-            # Termini tecnici e digitali comuni
-            'computer', 'internet', 'sito', 'email', 'telefono', 'cellulare', 'numero', 'link', 'collegamento',
-            'file', 'documento', 'foto', 'immagine', 'video', 'audio', 'messaggio', 'testo', 'pagina',
-            'gruppo', 'canale', 'chat', 'whatsapp', 'telegram', 'facebook', 'instagram', 'youtube',
-            'google', 'gmail', 'microsoft', 'windows', 'android', 'iphone', 'apple', 'samsung',
-            'password', 'utente', 'account', 'profilo', 'accesso', 'registrazione', 'login',
-            'download', 'upload', 'installare', 'installato', 'installata', 'aggiornare', 'aggiornato', 'aggiornata',
-            'configurare', 'configurato', 'configurata', 'impostare', 'impostato', 'impostata',
-            'connessione', 'connesso', 'connessa', 'disconnesso', 'disconnessa', 'collegato', 'collegata',
-            'online', 'offline', 'digitale', 'virtuale', 'elettronico', 'elettronica',
-            'automatico', 'automatica', 'manuale', 'manuali', 'sistema', 'sistemi', 'programma', 'programmi',
-            'applicazione', 'applicazioni', 'app', 'software', 'hardware', 'device', 'dispositivo', 'dispositivi',
-            'schermo', 'monitor', 'tastiera', 'mouse', 'stampante', 'scanner', 'cavo', 'cavi',
-            'batteria', 'caricatore', 'memoria', 'disco', 'usb', 'wifi', 'bluetooth', 'gps',
-            
-            # Mesi e giorni
-            'gennaio', 'febbraio', 'marzo', 'aprile', 'maggio', 'giugno',
-            'luglio', 'agosto', 'settembre', 'ottobre', 'novembre', 'dicembre',
-            'lunedì', 'martedì', 'mercoledì', 'giovedì', 'venerdì', 'sabato', 'domenica',
-            'mattina', 'pomeriggio', 'sera', 'notte', 'giorno', 'giorni', 'settimana', 'settimane',
-            'mese', 'mesi', 'anno', 'anni', 'tempo', 'volta', 'volte', 'ore', 'minuti', 'secondi',
-            
-            # Numeri scritti in lettere
-            'uno', 'due', 'tre', 'quattro', 'cinque', 'sei', 'sette', 'otto', 'nove', 'dieci',
-            'undici', 'dodici', 'tredici', 'quattordici', 'quindici', 'sedici', 'diciassette', 'diciotto', 'diciannove', 'venti',
-            'trenta', 'quaranta', 'cinquanta', 'sessanta', 'settanta', 'ottanta', 'novanta', 'cento', 'mille',
-            'primo', 'secondo', 'terzo', 'quarto', 'quinto', 'sesto', 'settimo', 'ottavo', 'nono', 'decimo',
-            
-            # Espressioni e interiezioni
-            'ecco', 'allora', 'infatti', 'comunque', 'tuttavia', 'inoltre', 'invece', 'piuttosto',
-            'soprattutto', 'specialmente', 'particolarmente', 'principalmente', 'generalmente', 'solitamente',
-            'probabilmente', 'possibilmente', 'certamente', 'sicuramente', 'ovviamente', 'naturalmente',
-            'sfortunatamente', 'fortunatamente', 'improvvisamente', 'immediatamente', 'velocemente', 'lentamente',
-            'attentamente', 'facilmente', 'difficilmente', 'chiaramente', 'completamente', 'perfettamente',
-            'abbastanza', 'parecchio', 'piuttosto', 'alquanto', 'estremamente', 'incredibilmente',
-            'assolutamente', 'relativamente', 'normalmente', 'regolarmente', 'raramente', 'spesso',
-            'talvolta', 'qualche', 'volta', 'alcuni', 'alcune', 'parecchi', 'parecchie', 'molti', 'molte',
-            'diversi', 'diverse', 'vari', 'varie', 'certi', 'certe', 'tutti', 'tutte', 'nessuno', 'nessuna',
-            'qualcuno', 'qualcuna', 'qualcosa', 'niente', 'nulla', 'ovunque', 'dovunque', 'dappertutto',
-            'altrove', 'laggiù', 'lassù', 'quaggiù', 'quassù', 'sopra', 'sotto', 'dentro', 'fuori',
-            'davanti', 'dietro', 'accanto', 'vicino', 'lontano', 'intorno', 'attraverso', 'lungo', 'contro',
-            'verso', 'fino', 'durante', 'prima', 'dopo', 'mentre', 'quando', 'appena', 'finché',
-            'sebbene', 'benché', 'nonostante', 'purché', 'affinché', 'perché', 'poiché', 'siccome',
-            'dato', 'visto', 'considerato', 'tranne', 'eccetto', 'salvo', 'oltre', 'incluso', 'compreso'
-        }
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"ℹ️ ANALISI LINGUA per: '{clean_text[:100]}...'")
         
-        # Pattern tipicamente italiani (mantenuti dal codice originale)
-        italian_patterns = [
-            r'\b\w+zione\b',  # -zione (situazione, informazione, etc.)
-            r'\b\w+mente\b',  # -mente (ovviamente, chiaramente, etc.)
-            r'\b\w+aggio\b',  # -aggio (messaggio, viaggio, etc.)
-            r'\b\w+ezza\b',   # -ezza (bellezza, tristezza, etc.)
-            r'\b\w+ità\b',    # -ità (città, università, etc.)
-            r'\bgli\s+\w+\b', # articolo "gli"
-            r'\bdegli\s+\w+\b', # "degli"
-            r'\bdella\s+\w+\b', # "della"
-            r'\bnella\s+\w+\b', # "nella"
-            r'\bche\s+\w+\b',   # congiunzione "che"
-            r'\bcon\s+\w+\b',   # preposizione "con"
-            r'\bper\s+\w+\b',   # preposizione "per"
-            r'\bdi\s+\w+\b',    # preposizione "di"
-            r'\bda\s+\w+\b',    # preposizione "da"
-            r'\ba\s+\w+\b',     # preposizione "a"
-            r'\bin\s+\w+\b',    # preposizione "in"
-            r'\bsu\s+\w+\b',    # preposizione "su"
-            r'\btra\s+\w+\b',   # preposizione "tra"
-            r'\bfra\s+\w+\b',   # preposizione "fra"
-            r'\bsono\s+\w+\b',  # verbo "sono"
-            r'\bsiamo\s+\w+\b', # verbo "siamo"
-            r'\bho\s+\w+\b',    # verbo "ho"
-            r'\bhai\s+\w+\b',   # verbo "hai"
-            r'\bha\s+\w+\b',    # verbo "ha"
-            r'\babbiamo\s+\w+\b', # verbo "abbiamo"
-            r'\bavete\s+\w+\b', # verbo "avete"
-            r'\bhanno\s+\w+\b', # verbo "hanno"
-            r'\bè\s+\w+\b',     # verbo "è"
-            r'\bsarà\s+\w+\b',  # verbo "sarà"
-            r'\bsono\s+\w+\b',  # verbo "sono"
-            r'\bsiete\s+\w+\b', # verbo "siete"
-            r'\bquello\s+\w+\b', # pronome "quello"
-            r'\bquella\s+\w+\b', # pronome "quella"
-            r'\bquesti\s+\w+\b', # pronome "questi"
-            r'\bqueste\s+\w+\b', # pronome "queste"
-            r'\bquelli\s+\w+\b', # pronome "quelli"
-            r'\bquelle\s+\w+\b', # pronome "quelle"
-            r'\bquesto\s+\w+\b', # pronome "questo"
-            r'\bquesta\s+\w+\b', # pronome "questa"
-        ]
-        
-        # Normalizzazione del testo
-        def normalize_repeated_chars(word):
-            return re.sub(r'(.)\1+', r'\1', word)
-        
-        # Estrazione parole (escludendo punteggiatura)
-        words_in_text_lower_no_punct = set(re.sub(r'[^\w\s]', '', clean_text.lower()).split())
-        words_in_text_lower_no_punct = {word for word in words_in_text_lower_no_punct if word and len(word) > 1}
+        # Testo minuscolo e parole calcolati una sola volta
+        clean_lower = clean_text.lower()
+
+        # Estrazione parole (escludendo punteggiatura e parole di un solo carattere),
+        # riusate da tutti i controlli successivi
+        words_in_text_lower_no_punct = {word for word in _PUNCTUATION_RE.sub('', clean_lower).split() if len(word) > 1}
         
         # CONTROLLO 1: Indicatori italiani diretti
         found_strong_italian_indicator = False
-        italian_words_found = words_in_text_lower_no_punct.intersection(italian_indicators)
-        if italian_words_found:
-            self.logger.debug(f"✅ Italiano CONFERMATO (indicatori diretti: {list(italian_words_found)}) per: '{clean_text[:100]}...'")
+        # isdisjoint si ferma al primo indicatore trovato senza costruire un nuovo set
+        if not words_in_text_lower_no_punct.isdisjoint(ITALIAN_INDICATORS):
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"✅ Italiano CONFERMATO (indicatori diretti: {list(words_in_text_lower_no_punct & ITALIAN_INDICATORS)}) per: '{clean_text[:100]}...'")
             found_strong_italian_indicator = True
         
         # CONTROLLO 2: Indicatori italiani dopo normalizzazione caratteri ripetuti
         if not found_strong_italian_indicator:
-            normalized_words_for_check = {normalize_repeated_chars(word) for word in words_in_text_lower_no_punct}
-            normalized_italian_found = normalized_words_for_check.intersection(italian_indicators)
-            if normalized_italian_found:
-                self.logger.debug(f"✅ Italiano CONFERMATO (indicatori post-normalizzazione: {list(normalized_italian_found)}) per: '{clean_text[:100]}...'")
+            normalized_words_for_check = {_REPEATED_CHARS_RE.sub(r'\1', word) for word in words_in_text_lower_no_punct}
+            if not normalized_words_for_check.isdisjoint(ITALIAN_INDICATORS):
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"✅ Italiano CONFERMATO (indicatori post-normalizzazione: {list(normalized_words_for_check & ITALIAN_INDICATORS)}) per: '{clean_text[:100]}...'")
                 found_strong_italian_indicator = True
         
-        # CONTROLLO 3: Pattern italiani
+        # CONTROLLO 3: Morfologia e costrutti tipicamente italiani
         if not found_strong_italian_indicator:
-            text_for_patterns = unidecode.unidecode(clean_text.lower())
-            for pattern in italian_patterns:
-                if re.search(pattern, text_for_patterns):
-                    matches = re.findall(pattern, text_for_patterns)
-                    self.logger.debug(f"✅ Italiano CONFERMATO (pattern '{pattern}': {matches}) per: '{clean_text[:100]}...'")
+            suffix_word = next((word for word in words_in_text_lower_no_punct
+                                if word.endswith(ITALIAN_SUFFIXES) and word not in ITALIAN_SUFFIXES), None)
+            if suffix_word:
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug(f"✅ Italiano CONFERMATO (suffisso italiano: '{suffix_word}') per: '{clean_text[:100]}...'")
+                found_strong_italian_indicator = True
+            else:
+                text_for_patterns = clean_lower if clean_lower.isascii() else _transliterate(clean_lower)
+                construct_match = ITALIAN_CONSTRUCTS_RE.search(text_for_patterns)
+                if construct_match:
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"✅ Italiano CONFERMATO (costrutto: '{construct_match.group(0)}') per: '{clean_text[:100]}...'")
                     found_strong_italian_indicator = True
-                    break
         
         # Se abbiamo trovato indicatori italiani forti, il messaggio è consentito
         if found_strong_italian_indicator:
             return False
         
+        # Conteggio alfabetico (un solo passaggio regex), necessario solo da qui in poi:
+        # i messaggi confermati italiani dagli indicatori non lo calcolano
+        total_alpha_chars_original = len(_ALPHA_RE.findall(clean_text))
+
         # CONTROLLO 4: Caratteri non-latini (cirillico, arabo, cinese)
-        cyrillic_chars = sum(1 for char in clean_text if 'Ѐ' <= char <= 'ӿ' or 'Ԁ' <= char <= 'ԯ')
-        arabic_chars = sum(1 for char in clean_text if '؀' <= char <= 'ۿ')
-        chinese_chars = sum(1 for char in clean_text if '一' <= char <= '鿿')
-        total_alpha_chars_original = len([c for c in clean_text if c.isalpha()])
+        non_latin_chars = 0 if clean_text.isascii() else len(_NON_LATIN_RE.findall(clean_text))
         
-        if total_alpha_chars_original > 0:
-            non_latin_ratio = (cyrillic_chars + arabic_chars + chinese_chars) / total_alpha_chars_original
+        if non_latin_chars and total_alpha_chars_original > 0:
+            non_latin_ratio = non_latin_chars / total_alpha_chars_original
             if non_latin_ratio > 0.3:
                 self.logger.info(f"❌ Lingua NON CONSENTITA (rapporto non-latino: {non_latin_ratio:.2%}) in '{clean_text[:100]}...'")
                 return True
         
         # CONTROLLO 5: Controllo inglese MIGLIORATO (meno aggressivo)
-        # Lista di parole inglesi che NON sono ambigue con l'italiano
-        strict_english_only = {
-            'hello', 'goodbye', 'please', 'thank', 'thanks', 'welcome', 'sorry',
-            'how', 'what', 'where', 'when', 'why', 'who', 'which',
-            'can', 'could', 'would', 'should', 'will', 'shall', 'might', 'must',
-            'have', 'has', 'had', 'was', 'were', 'been', 'being',
-            'make', 'made', 'take', 'took', 'come', 'came', 'went', 'going',
-            'get', 'got', 'give', 'gave', 'put', 'let', 'set',
-            'think', 'thought', 'know', 'knew', 'see', 'saw', 'look', 'tell', 'said',
-            'want', 'need', 'like', 'love', 'hate', 'feel', 'seem', 'become',
-            'find', 'found', 'keep', 'kept', 'leave', 'left', 'bring', 'brought',
-            'turn', 'turned', 'show', 'showed', 'ask', 'asked', 'try', 'tried',
-            'use', 'used', 'work', 'worked', 'call', 'called', 'move', 'moved',
-            'play', 'played', 'run', 'ran', 'walk', 'walked', 'sit', 'sat',
-            'stand', 'stood', 'read', 'write', 'wrote', 'listen', 'heard',
-            'speak', 'spoke', 'talk', 'talked', 'eat', 'ate', 'drink', 'drank',
-            'sleep', 'slept', 'wake', 'woke', 'open', 'opened', 'close', 'closed',
-            'start', 'started', 'stop', 'stopped', 'finish', 'finished', 'end', 'ended',
-            'begin', 'began', 'continue', 'continued', 'change', 'changed', 'help', 'helped',
-            'learn', 'learned', 'teach', 'taught', 'study', 'studied', 'remember', 'forgot',
-            'understand', 'understood', 'believe', 'believed', 'hope', 'hoped', 'wish', 'wished',
-            'buy', 'bought', 'sell', 'sold', 'pay', 'paid', 'cost', 'spend', 'spent',
-            'live', 'lived', 'stay', 'stayed', 'visit', 'visited', 'travel', 'traveled',
-            'meet', 'met', 'join', 'joined', 'follow', 'followed', 'lead', 'led',
-            'win', 'won', 'lose', 'lost', 'fight', 'fought', 'kill', 'killed',
-            'die', 'died', 'born', 'grow', 'grew', 'build', 'built', 'create', 'created',
-            'destroy', 'destroyed', 'break', 'broke', 'fix', 'fixed', 'repair', 'repaired',
-            'clean', 'cleaned', 'wash', 'washed', 'cook', 'cooked', 'cut', 'cut',
-            'pull', 'pulled', 'push', 'pushed', 'throw', 'threw', 'catch', 'caught',
-            'hold', 'held', 'carry', 'carried', 'pick', 'picked', 'drop', 'dropped',
-            'send', 'sent', 'receive', 'received', 'give', 'gave', 'take', 'took',
-            'choose', 'chose', 'decide', 'decided', 'agree', 'agreed', 'disagree', 'disagreed',
-            'accept', 'accepted', 'refuse', 'refused', 'allow', 'allowed', 'permit', 'permitted',
-            'forbid', 'forbidden', 'force', 'forced', 'let', 'protect', 'protected',
-            'save', 'saved', 'rescue', 'rescued', 'escape', 'escaped', 'avoid', 'avoided',
-            'prevent', 'prevented', 'cause', 'caused', 'happen', 'happened', 'occur', 'occurred',
-            'exist', 'existed', 'appear', 'appeared', 'disappear', 'disappeared', 'remain', 'remained',
-            'contain', 'contained', 'include', 'included', 'involve', 'involved', 'depend', 'depended',
-            'belong', 'belonged', 'own', 'owned', 'share', 'shared', 'offer', 'offered',
-            'provide', 'provided', 'supply', 'supplied', 'deliver', 'delivered', 'serve', 'served',
-            'support', 'supported', 'manage', 'managed', 'control', 'controlled', 'handle', 'handled',
-            'deal', 'dealt', 'treat', 'treated', 'care', 'cared', 'worry', 'worried',
-            'fear', 'feared', 'surprise', 'surprised', 'shock', 'shocked', 'amaze', 'amazed',
-            'confuse', 'confused', 'explain', 'explained', 'describe', 'described', 'discuss', 'discussed',
-            'argue', 'argued', 'complain', 'complained', 'suggest', 'suggested', 'recommend', 'recommended',
-            'advise', 'advised', 'warn', 'warned', 'remind', 'reminded', 'inform', 'informed',
-            'announce', 'announced', 'declare', 'declared', 'claim', 'claimed', 'state', 'stated',
-            'mention', 'mentioned', 'report', 'reported', 'confirm', 'confirmed', 'deny', 'denied',
-            'admit', 'admitted', 'confess', 'confessed', 'lie', 'lied', 'steal', 'stole',
-            'cheat', 'cheated', 'trick', 'tricked', 'fool', 'fooled', 'joke', 'joked',
-            'laugh', 'laughed', 'smile', 'smiled', 'cry', 'cried', 'shout', 'shouted',
-            'whisper', 'whispered', 'sing', 'sang', 'dance', 'danced', 'jump', 'jumped',
-            'climb', 'climbed', 'fall', 'fell', 'fly', 'flew', 'swim', 'swam',
-            'drive', 'drove', 'ride', 'rode', 'arrive', 'arrived', 'reach', 'reached',
-            'return', 'returned', 'enter', 'entered', 'exit', 'exited', 'approach', 'approached',
-            'pass', 'passed', 'cross', 'crossed', 'follow', 'followed', 'chase', 'chased',
-            'search', 'searched', 'explore', 'explored', 'discover', 'discovered', 'notice', 'noticed',
-            'observe', 'observed', 'watch', 'watched', 'examine', 'examined', 'check', 'checked',
-            'test', 'tested', 'try', 'tried', 'attempt', 'attempted', 'practice', 'practiced',
-            'train', 'trained', 'exercise', 'exercised', 'compete', 'competed', 'race', 'raced',
-            'play', 'played', 'game', 'games', 'sport', 'sports', 'team', 'teams',
-            'player', 'players', 'coach', 'coaches', 'fan', 'fans', 'audience', 'audiences',
-            'show', 'shows', 'movie', 'movies', 'film', 'films', 'book', 'books',
-            'story', 'stories', 'news', 'information', 'data', 'fact', 'facts',
-            'idea', 'ideas', 'thought', 'thoughts', 'opinion', 'opinions', 'view', 'views',
-            'point', 'points', 'reason', 'reasons', 'cause', 'causes', 'effect', 'effects',
-            'result', 'results', 'answer', 'answers', 'question', 'questions', 'problem', 'problems',
-            'solution', 'solutions', 'method', 'methods', 'way', 'ways', 'manner', 'manners',
-            'style', 'styles', 'type', 'types', 'kind', 'kinds', 'sort', 'sorts',
-            'class', 'classes', 'group', 'groups', 'team', 'teams', 'member', 'members',
-            'person', 'people', 'human', 'humans', 'man', 'men', 'woman', 'women',
-            'child', 'children', 'baby', 'babies', 'boy', 'boys', 'girl', 'girls',
-            'family', 'families', 'parent', 'parents', 'mother', 'mothers', 'father', 'fathers',
-            'brother', 'brothers', 'sister', 'sisters', 'friend', 'friends', 'enemy', 'enemies',
-            'neighbor', 'neighbors', 'stranger', 'strangers', 'guest', 'guests', 'host', 'hosts',
-            'customer', 'customers', 'client', 'clients', 'boss', 'bosses', 'worker', 'workers',
-            'employee', 'employees', 'employer', 'employers', 'job', 'jobs', 'work', 'works',
-            'business', 'businesses', 'company', 'companies', 'office', 'offices', 'store', 'stores',
-            'shop', 'shops', 'market', 'markets', 'bank', 'banks', 'school', 'schools',
-            'university', 'universities', 'college', 'colleges', 'class', 'classes', 'student', 'students',
-            'teacher', 'teachers', 'professor', 'professors', 'doctor', 'doctors', 'nurse', 'nurses',
-            'hospital', 'hospitals', 'medicine', 'medicines', 'health', 'healthy', 'sick', 'disease',
-            'pain', 'hurt', 'injury', 'accident', 'emergency', 'danger', 'safe', 'safety',
-            'police', 'crime', 'law', 'legal', 'court', 'judge', 'jury', 'lawyer',
-            'government', 'politics', 'president', 'minister', 'election', 'vote', 'citizen', 'country',
-            'nation', 'state', 'city', 'town', 'village', 'place', 'location', 'address',
-            'street', 'road', 'avenue', 'building', 'house', 'home', 'apartment', 'room',
-            'kitchen', 'bathroom', 'bedroom', 'living', 'garden', 'yard', 'garage', 'basement',
-            'floor', 'ceiling', 'wall', 'door', 'window', 'roof', 'stairs', 'elevator',
-            'furniture', 'table', 'chair', 'bed', 'sofa', 'desk', 'shelf', 'mirror',
-            'picture', 'painting', 'photo', 'image', 'color', 'colors', 'red', 'blue',
-            'green', 'yellow', 'orange', 'purple', 'pink', 'brown', 'black', 'white',
-            'grey', 'gray', 'light', 'dark', 'bright', 'clear', 'transparent', 'thick',
-            'thin', 'wide', 'narrow', 'long', 'short', 'tall', 'high', 'low',
-            'big', 'large', 'huge', 'giant', 'small', 'tiny', 'little', 'medium',
-            'heavy', 'light', 'strong', 'weak', 'hard', 'soft', 'smooth', 'rough',
-            'hot', 'warm', 'cool', 'cold', 'freezing', 'wet', 'dry', 'clean', 'dirty',
-            'new', 'old', 'young', 'fresh', 'stale', 'good', 'bad', 'great', 'terrible',
-            'wonderful', 'amazing', 'beautiful', 'ugly', 'nice', 'pleasant', 'horrible', 'awful',
-            'perfect', 'excellent', 'outstanding', 'poor', 'rich', 'expensive', 'cheap', 'free',
-            'easy', 'difficult', 'hard', 'simple', 'complex', 'complicated', 'clear', 'obvious',
-            'strange', 'weird', 'normal', 'usual', 'common', 'rare', 'special', 'ordinary',
-            'important', 'serious', 'funny', 'interesting', 'boring', 'exciting', 'surprising', 'shocking',
-            'happy', 'sad', 'angry', 'mad', 'calm', 'peaceful', 'nervous', 'worried',
-            'afraid', 'scared', 'brave', 'proud', 'ashamed', 'embarrassed', 'confident', 'shy',
-            'lonely', 'popular', 'famous', 'unknown', 'public', 'private', 'secret', 'open',
-            'closed', 'full', 'empty', 'complete', 'incomplete', 'finished', 'ready', 'busy',
-            'free', 'available', 'possible', 'impossible', 'necessary', 'optional', 'required', 'forbidden',
-            'allowed', 'permitted', 'legal', 'illegal', 'right', 'wrong', 'correct', 'incorrect',
-            'true', 'false', 'real', 'fake', 'actual', 'virtual', 'original', 'copy',
-            'first', 'second', 'third', 'last', 'final', 'next', 'previous', 'following',
-            'single', 'double', 'triple', 'multiple', 'few', 'several', 'many', 'much',
-            'more', 'most', 'less', 'least', 'enough', 'too', 'very', 'quite',
-            'rather', 'pretty', 'fairly', 'extremely', 'incredibly', 'absolutely', 'completely', 'totally',
-            'almost', 'nearly', 'about', 'approximately', 'exactly', 'precisely', 'roughly', 'generally',
-            'usually', 'normally', 'typically', 'often', 'sometimes', 'rarely', 'never', 'always',
-            'forever', 'temporary', 'permanent', 'constant', 'stable', 'changing', 'moving', 'still',
-            'active', 'passive', 'alive', 'dead', 'living', 'dying', 'growing', 'shrinking',
-            'increasing', 'decreasing', 'rising', 'falling', 'improving', 'worsening', 'developing', 'declining',
-            'successful', 'unsuccessful', 'winning', 'losing', 'leading', 'following', 'ahead', 'behind',
-            'early', 'late', 'slow', 'fast', 'quick', 'rapid', 'sudden', 'gradual',
-            'immediate', 'instant', 'delayed', 'urgent', 'emergency', 'priority', 'important', 'minor',
-            'major', 'main', 'primary', 'secondary', 'basic', 'advanced', 'elementary', 'fundamental',
-            'essential', 'necessary', 'optional', 'extra', 'additional', 'spare', 'reserve', 'backup',
-            'original', 'duplicate', 'copy', 'version', 'edition', 'model', 'brand', 'type',
-            'category', 'section', 'part', 'piece', 'item', 'object', 'thing', 'stuff',
-            'material', 'substance', 'element', 'component', 'ingredient', 'content', 'subject', 'topic',
-            'theme', 'issue', 'matter', 'affair', 'business', 'concern', 'interest', 'hobby',
-            'activity', 'action', 'movement', 'motion', 'behavior', 'conduct', 'attitude', 'approach',
-            'method', 'technique', 'skill', 'ability', 'talent', 'gift', 'power', 'strength',
-            'weakness', 'advantage', 'disadvantage', 'benefit', 'profit', 'loss', 'gain', 'cost',
-            'price', 'value', 'worth', 'quality', 'quantity', 'amount', 'number', 'figure',
-            'total', 'sum', 'average', 'minimum', 'maximum', 'limit', 'range', 'scale',
-            'level', 'degree', 'grade', 'rank', 'position', 'status', 'condition', 'situation',
-            'state', 'circumstance', 'case', 'example', 'instance', 'occasion', 'opportunity', 'chance',
-            'possibility', 'probability', 'risk', 'danger', 'threat', 'warning', 'alarm', 'signal',
-            'sign', 'symbol', 'mark', 'label', 'tag', 'name', 'title', 'heading',
-            'caption', 'description', 'explanation', 'definition', 'meaning', 'sense', 'purpose', 'goal',
-            'aim', 'target', 'objective', 'plan', 'strategy', 'tactic', 'approach', 'method',
-            'system', 'process', 'procedure', 'operation', 'function', 'role', 'job', 'task',
-            'duty', 'responsibility', 'obligation', 'requirement', 'rule', 'regulation', 'policy', 'principle',
-            'law', 'standard', 'norm', 'custom', 'tradition', 'culture', 'society', 'community',
-            'public', 'audience', 'crowd', 'mass', 'population', 'generation', 'age', 'era',
-            'period', 'time', 'moment', 'instant', 'second', 'minute', 'hour', 'day',
-            'week', 'month', 'year', 'decade', 'century', 'millennium', 'past', 'present',
-            'future', 'history', 'story', 'tale', 'account', 'report', 'record', 'document',
-            'paper', 'file', 'folder', 'book', 'magazine', 'newspaper', 'article', 'page',
-            'chapter', 'section', 'paragraph', 'sentence', 'word', 'letter', 'character', 'symbol',
-            'number', 'digit', 'figure', 'calculation', 'mathematics', 'science', 'technology', 'computer',
-            'internet', 'website', 'email', 'message', 'communication', 'conversation', 'discussion', 'debate',
-            'argument', 'fight', 'conflict', 'war', 'peace', 'agreement', 'deal', 'contract',
-            'promise', 'commitment', 'decision', 'choice', 'option', 'alternative', 'selection', 'preference',
-            'opinion', 'view', 'belief', 'faith', 'religion', 'god', 'church', 'prayer',
-            'hope', 'wish', 'dream', 'nightmare', 'reality', 'truth', 'fact', 'lie',
-            'secret', 'mystery', 'surprise', 'shock', 'wonder', 'miracle', 'magic', 'spell',
-            'curse', 'blessing', 'luck', 'fortune', 'chance', 'fate', 'destiny', 'future',
-            'prediction', 'forecast', 'weather', 'climate', 'temperature', 'season', 'spring', 'summer',
-            'autumn', 'winter', 'rain', 'snow', 'wind', 'storm', 'thunder', 'lightning',
-            'sun', 'moon', 'star', 'planet', 'earth', 'world', 'universe', 'space',
-            'nature', 'environment', 'air', 'water', 'fire', 'earth', 'ground', 'soil',
-            'rock', 'stone', 'mountain', 'hill', 'valley', 'river', 'lake', 'ocean',
-            'sea', 'beach', 'forest', 'tree', 'plant', 'flower', 'grass', 'leaf',
-            'animal', 'bird', 'fish', 'dog', 'cat', 'horse', 'cow', 'pig',
-            'chicken', 'sheep', 'goat', 'rabbit', 'mouse', 'rat', 'lion', 'tiger',
-            'elephant', 'monkey', 'snake', 'spider', 'insect', 'butterfly', 'bee', 'ant',
-            'food', 'meal', 'breakfast', 'lunch', 'dinner', 'snack', 'drink', 'water',
-            'milk', 'juice', 'coffee', 'tea', 'beer', 'wine', 'alcohol', 'sugar',
-            'salt', 'pepper', 'spice', 'herb', 'oil', 'butter', 'cheese', 'meat',
-            'beef', 'pork', 'chicken', 'fish', 'egg', 'bread', 'cake', 'cookie',
-            'fruit', 'apple', 'orange', 'banana', 'grape', 'strawberry', 'vegetable', 'potato',
-            'tomato', 'onion', 'carrot', 'lettuce', 'rice', 'pasta', 'pizza', 'sandwich',
-            'soup', 'salad', 'sauce', 'dish', 'plate', 'bowl', 'cup', 'glass',
-            'bottle', 'can', 'box', 'bag', 'package', 'container', 'jar', 'pot',
-            'pan', 'knife', 'fork', 'spoon', 'tool', 'equipment', 'machine', 'device',
-            'instrument', 'apparatus', 'gadget', 'appliance', 'vehicle', 'car', 'truck', 'bus',
-            'train', 'plane', 'ship', 'boat', 'bicycle', 'motorcycle', 'wheel', 'engine',
-            'motor', 'fuel', 'gas', 'oil', 'electricity', 'energy', 'power', 'battery',
-            'wire', 'cable', 'rope', 'chain', 'metal', 'iron', 'steel', 'gold',
-            'silver', 'copper', 'plastic', 'rubber', 'glass', 'wood', 'paper', 'cloth',
-            'fabric', 'leather', 'cotton', 'wool', 'silk', 'clothes', 'clothing', 'dress',
-            'shirt', 'pants', 'skirt', 'coat', 'jacket', 'hat', 'cap', 'shoe',
-            'boot', 'sock', 'glove', 'belt', 'watch', 'jewelry', 'ring', 'necklace',
-            'money', 'cash', 'coin', 'bill', 'dollar', 'cent', 'bank', 'account',
-            'credit', 'debt', 'loan', 'interest', 'investment', 'business', 'trade', 'market',
-            'economy', 'industry', 'factory', 'production', 'manufacturing', 'construction', 'building', 'architecture',
-            'design', 'art', 'music', 'song', 'dance', 'performance', 'show', 'entertainment',
-            'game', 'sport', 'competition', 'match', 'race', 'tournament', 'championship', 'victory',
-            'defeat', 'winner', 'loser', 'prize', 'reward', 'gift', 'present', 'surprise',
-            'party', 'celebration', 'festival', 'holiday', 'vacation', 'trip', 'journey', 'travel',
-            'tour', 'visit', 'adventure', 'experience', 'memory', 'photograph', 'picture', 'image',
-            'video', 'film', 'movie', 'television', 'radio', 'newspaper', 'magazine', 'book',
-            'library', 'education', 'school', 'university', 'college', 'student', 'teacher', 'professor',
-            'lesson', 'class', 'course', 'subject', 'exam', 'test', 'homework', 'assignment',
-            'grade', 'mark', 'score', 'result', 'achievement', 'success', 'failure', 'mistake',
-            'error', 'problem', 'difficulty', 'challenge', 'obstacle', 'barrier', 'limitation', 'restriction',
-            'permission', 'approval', 'acceptance', 'rejection', 'refusal', 'denial', 'confirmation', 'verification',
-            'proof', 'evidence', 'witness', 'testimony', 'statement', 'declaration', 'announcement', 'advertisement',
-            'publicity', 'promotion', 'campaign', 'marketing', 'sales', 'purchase', 'shopping', 'customer',
-            'service', 'quality', 'satisfaction', 'complaint', 'criticism', 'praise', 'compliment', 'thanks',
-            'gratitude', 'appreciation', 'respect', 'admiration', 'love', 'affection', 'friendship', 'relationship',
-            'marriage', 'wedding', 'divorce', 'separation', 'birth', 'death', 'funeral', 'cemetery',
-            'grave', 'spirit', 'soul', 'mind', 'brain', 'thought', 'idea', 'imagination',
-            'creativity', 'inspiration', 'motivation', 'encouragement', 'support', 'help', 'assistance', 'aid',
-            'rescue', 'salvation', 'protection', 'security', 'safety', 'danger', 'risk', 'threat',
-            'attack', 'defense', 'weapon', 'gun', 'knife', 'sword', 'bomb', 'explosion',
-            'fire', 'smoke', 'flame', 'heat', 'burn', 'pain', 'suffering', 'agony',
-            'torture', 'punishment', 'penalty', 'fine', 'prison', 'jail', 'cell', 'freedom',
-            'liberty', 'independence', 'democracy', 'republic', 'monarchy', 'dictatorship', 'tyranny', 'oppression',
-            'revolution', 'rebellion', 'protest', 'demonstration', 'strike', 'boycott', 'resistance', 'opposition',
-            'enemy', 'opponent', 'rival', 'competitor', 'ally', 'partner', 'colleague', 'teammate',
-            'cooperation', 'collaboration', 'partnership', 'alliance', 'union', 'organization', 'institution', 'association',
-            'society', 'club', 'group', 'team', 'crew', 'staff', 'personnel', 'workforce',
-            'employee', 'worker', 'laborer', 'professional', 'expert', 'specialist', 'consultant', 'advisor',
-            'manager', 'director', 'supervisor', 'boss', 'leader', 'chief', 'president', 'chairman',
-            'owner', 'founder', 'creator', 'inventor', 'designer', 'architect', 'engineer', 'scientist',
-            'researcher', 'scholar', 'academic', 'intellectual', 'philosopher', 'writer', 'author', 'poet',
-            'artist', 'painter', 'musician', 'singer', 'actor', 'performer', 'celebrity', 'star',
-            'hero', 'champion', 'winner', 'master', 'expert', 'genius', 'talent', 'skill',
-            'ability', 'capacity', 'capability', 'potential', 'opportunity', 'chance', 'possibility', 'probability',
-            'certainty', 'uncertainty', 'doubt', 'confidence', 'trust', 'faith', 'belief', 'conviction',
-            'opinion', 'judgment', 'evaluation', 'assessment', 'analysis', 'examination', 'investigation', 'research',
-            'study', 'survey', 'interview', 'questionnaire', 'poll', 'vote', 'election', 'campaign',
-            'candidate', 'politician', 'government', 'administration', 'authority', 'power', 'control', 'influence',
-            'impact', 'effect', 'consequence', 'result', 'outcome', 'conclusion', 'summary', 'report',
-            'account', 'description', 'explanation', 'interpretation', 'translation', 'version', 'edition', 'copy',
-            'original', 'duplicate', 'reproduction', 'imitation', 'fake', 'forgery', 'counterfeit', 'fraud',
-            'crime', 'offense', 'violation', 'breach', 'infringement', 'trespass', 'invasion', 'intrusion',
-            'interference', 'disruption', 'disturbance', 'noise', 'sound', 'voice', 'speech', 'language',
-            'word', 'term', 'phrase', 'expression', 'statement', 'sentence', 'paragraph', 'text',
-            'document', 'paper', 'file', 'record', 'data', 'information', 'knowledge', 'wisdom',
-            'understanding', 'comprehension', 'awareness', 'consciousness', 'recognition', 'realization', 'discovery', 'invention',
-            'creation', 'innovation', 'improvement', 'development', 'progress', 'advancement', 'evolution', 'change',
-            'transformation', 'conversion', 'adaptation', 'adjustment', 'modification', 'alteration', 'revision', 'correction',
-            'fix', 'repair', 'maintenance', 'service', 'care', 'treatment', 'therapy', 'medicine',
-            'drug', 'medication', 'pill', 'tablet', 'capsule', 'injection', 'vaccine', 'surgery',
-            'operation', 'procedure', 'process', 'method', 'technique', 'approach', 'strategy', 'plan',
-            'program', 'project', 'scheme', 'system', 'structure', 'organization', 'arrangement', 'order',
-            'sequence', 'series', 'chain', 'link', 'connection', 'relationship', 'association', 'correlation',
-            'comparison', 'contrast', 'difference', 'similarity', 'resemblance', 'likeness', 'match', 'fit',
-            'suit', 'appropriate', 'suitable', 'proper', 'correct', 'right', 'accurate', 'precise',
-            'exact', 'specific', 'particular', 'special', 'unique', 'individual', 'personal', 'private',
-            'public', 'general', 'common', 'ordinary', 'normal', 'regular', 'standard', 'typical',
-            'average', 'medium', 'moderate', 'reasonable', 'fair', 'just', 'equal', 'balanced',
-            'stable', 'steady', 'consistent', 'constant', 'permanent', 'lasting', 'durable', 'strong',
-            'solid', 'firm', 'tight', 'secure', 'safe', 'protected', 'covered', 'hidden',
-            'secret', 'mysterious', 'unknown', 'unfamiliar', 'strange', 'odd', 'weird', 'unusual',
-            'extraordinary', 'remarkable', 'amazing', 'incredible', 'unbelievable', 'impossible', 'difficult', 'hard',
-            'tough', 'challenging', 'demanding', 'strict', 'severe', 'harsh', 'cruel', 'brutal',
-            'violent', 'aggressive', 'hostile', 'angry', 'furious', 'mad', 'crazy', 'insane',
-            'stupid', 'foolish', 'silly', 'ridiculous', 'absurd', 'nonsense', 'meaningless', 'pointless',
-            'useless', 'worthless', 'valuable', 'precious', 'expensive', 'costly', 'cheap', 'affordable',
-            'reasonable', 'fair', 'unfair', 'unjust', 'wrong', 'evil', 'bad', 'terrible',
-            'awful', 'horrible', 'disgusting', 'nasty', 'ugly', 'beautiful', 'pretty', 'attractive',
-            'handsome', 'gorgeous', 'lovely', 'nice', 'pleasant', 'enjoyable', 'fun', 'entertaining',
-            'interesting', 'exciting', 'thrilling', 'amazing', 'wonderful', 'fantastic', 'great', 'excellent',
-            'outstanding', 'perfect', 'ideal', 'best', 'better', 'good', 'fine', 'okay',
-            'alright', 'satisfactory', 'adequate', 'sufficient', 'enough', 'plenty', 'lots', 'many',
-            'much', 'more', 'most', 'all', 'every', 'each', 'both', 'either',
-            'neither', 'none', 'nothing', 'nobody', 'no', 'not', 'never', 'nowhere',
-            'yes', 'yeah', 'sure', 'certainly', 'definitely', 'absolutely', 'completely', 'totally',
-            'entirely', 'fully', 'quite', 'rather', 'pretty', 'very', 'extremely', 'incredibly',
-            'unbelievably', 'surprisingly', 'unexpectedly', 'suddenly', 'immediately', 'instantly', 'quickly', 'rapidly',
-            'fast', 'slow', 'slowly', 'carefully', 'gently', 'softly', 'quietly', 'silently',
-            'loudly', 'clearly', 'obviously', 'apparently', 'evidently', 'probably', 'possibly', 'maybe',
-            'perhaps', 'definitely', 'certainly', 'surely', 'truly', 'really', 'actually', 'indeed',
-            'finally', 'eventually', 'ultimately', 'basically', 'essentially', 'fundamentally', 'primarily', 'mainly',
-            'mostly', 'generally', 'usually', 'normally', 'typically', 'commonly', 'frequently', 'often',
-            'sometimes', 'occasionally', 'rarely', 'seldom', 'hardly', 'barely', 'scarcely', 'almost',
-            'nearly', 'about', 'around', 'approximately', 'roughly', 'exactly', 'precisely', 'specifically',
-            'particularly', 'especially', 'notably', 'remarkably', 'significantly', 'considerably', 'substantially', 'greatly',
-            'highly', 'deeply', 'seriously', 'badly', 'poorly', 'well', 'better', 'best',
-            'worse', 'worst', 'less', 'least', 'more', 'most', 'too', 'also',
-            'as', 'so', 'such', 'like', 'unlike', 'similar', 'different', 'same',
-            'other', 'another', 'else', 'otherwise', 'instead', 'rather', 'quite', 'fairly',
-            'pretty', 'somewhat', 'kind', 'sort', 'type', 'way', 'manner', 'style',
-            'form', 'shape', 'size', 'length', 'width', 'height', 'depth', 'weight',
-            'age', 'date', 'time', 'year', 'month', 'week', 'day', 'hour',
-            'minute', 'second', 'morning', 'afternoon', 'evening', 'night', 'today', 'tomorrow',
-            'yesterday', 'now', 'then', 'soon', 'late', 'early', 'before', 'after',
-            'during', 'while', 'until', 'since', 'from', 'to', 'into', 'onto',
-            'upon', 'over', 'under', 'below', 'above', 'behind', 'front', 'back',
-            'side', 'top', 'bottom', 'inside', 'outside', 'between', 'among', 'through',
-            'across', 'along', 'around', 'near', 'close', 'far', 'away', 'here',
-            'there', 'where', 'everywhere', 'anywhere', 'somewhere', 'nowhere', 'left', 'right',
-            'straight', 'forward', 'backward', 'up', 'down', 'north', 'south', 'east',
-            'west', 'center', 'middle', 'edge', 'corner', 'end', 'beginning', 'start',
-            'finish', 'complete', 'whole', 'part', 'piece', 'bit', 'some', 'any',
-            'every', 'all', 'none', 'few', 'several', 'many', 'much', 'little',
-            'enough', 'plenty', 'lots', 'tons', 'dozens', 'hundreds', 'thousands', 'millions',
-            'zero', 'one', 'two', 'three', 'four', 'five', 'six', 'seven',
-            'eight', 'nine', 'ten', 'eleven', 'twelve', 'thirteen', 'fourteen', 'fifteen',
-            'sixteen', 'seventeen', 'eighteen', 'nineteen', 'twenty', 'thirty', 'forty', 'fifty',
-            'sixty', 'seventy', 'eighty', 'ninety', 'hundred', 'thousand', 'million', 'billion'
-        }
         
         # CONTROLLO MIGLIORATO: Solo se il messaggio è tra 2-10 parole E tutte sono inglesi STRICT
         if 2 <= len(words_in_text_lower_no_punct) <= 10:
-            english_words_found_in_msg = words_in_text_lower_no_punct.intersection(strict_english_only)
-            if len(english_words_found_in_msg) == len(words_in_text_lower_no_punct):
+            if words_in_text_lower_no_punct.issubset(STRICT_ENGLISH_ONLY):
                 # CONTROLLO AGGIUNTIVO: Verifica se ci sono parole che potrebbero essere italiane
                 # anche se sono nel set inglese (come "no", "ok", etc.)
-                ambiguous_words = {'no', 'ok', 'okay', 'stop', 'start', 'post', 'master', 'computer', 'internet', 'email'}
-                if words_in_text_lower_no_punct.intersection(ambiguous_words):
-                    self.logger.debug(f"✅ Parole ambigue rilevate ({words_in_text_lower_no_punct.intersection(ambiguous_words)}), considerato italiano. PERMESSO: '{clean_text[:100]}...'")
+                if not words_in_text_lower_no_punct.isdisjoint(AMBIGUOUS_WORDS):
+                    if self.logger.isEnabledFor(logging.DEBUG):
+                        self.logger.debug(f"✅ Parole ambigue rilevate ({words_in_text_lower_no_punct & AMBIGUOUS_WORDS}), considerato italiano. PERMESSO: '{clean_text[:100]}...'")
                     return False
                 
-                self.logger.info(f"❌ Lingua NON CONSENTITA (probabilmente solo Inglese strict: {list(english_words_found_in_msg)}) in '{clean_text[:100]}...'")
+                self.logger.info(f"❌ Lingua NON CONSENTITA (probabilmente solo Inglese strict: {list(words_in_text_lower_no_punct)}) in '{clean_text[:100]}...'")
                 return True
         
-        # CONTROLLO 6: Langdetect per testi più lunghi (≥20 caratteri alfabetici)
+        # CONTROLLO 6: Langdetect per testi più lunghi (≥20 caratteri alfabetici).
+        # Si arriva qui solo se i controlli economici (indicatori, suffissi,
+        # costrutti, alfabeti non latini, inglese strict) non hanno deciso;
+        # gli esiti di detect_language sono comunque memorizzati per testo.
         if total_alpha_chars_original >= 20:
             detected_lang_code = self.detect_language(clean_text)
             if detected_lang_code:
-                lang_mapping = {'italian': 'it', 'it': 'it'}
-                allowed_codes = [lang_mapping.get(lang.lower(), lang.lower()) for lang in self.allowed_languages]
-                if detected_lang_code not in allowed_codes:
+                if detected_lang_code not in self._allowed_language_codes:
                     # CONTROLLO FALLBACK MIGLIORATO: Verifica presenza italiana
-                    italian_words_found_set_for_fallback = words_in_text_lower_no_punct.intersection(italian_indicators)
+                    italian_words_found_set_for_fallback = words_in_text_lower_no_punct.intersection(ITALIAN_INDICATORS)
                     if len(words_in_text_lower_no_punct) > 0:
                         italian_word_ratio_in_fallback = len(italian_words_found_set_for_fallback) / len(words_in_text_lower_no_punct)
                         # SOGLIA RIDOTTA: 15% invece di 20% per essere meno aggressivi
@@ -807,13 +1258,15 @@ class AdvancedModerationBotLogic:
                             self.logger.info(f"✅ Langdetect ha rilevato '{detected_lang_code}', ma presenza italiana significativa ({italian_word_ratio_in_fallback:.2%}, parole: {list(italian_words_found_set_for_fallback)}) sovrascrive. PERMESSO: '{clean_text[:100]}...'")
                             return False
                     
-                    self.logger.info(f"❌ Lingua NON CONSENTITA (Langdetect: '{detected_lang_code}', consentite: {allowed_codes}) per '{clean_text[:100]}...'")
+                    self.logger.info(f"❌ Lingua NON CONSENTITA (Langdetect: '{detected_lang_code}', consentite: {sorted(self._allowed_language_codes)}) per '{clean_text[:100]}...'")
                     return True
         else:
-            self.logger.debug(f"✅ Testo troppo breve per Langdetect ({total_alpha_chars_original} caratteri alfabetici < 20). PERMESSO (default).")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"✅ Testo troppo breve per Langdetect ({total_alpha_chars_original} caratteri alfabetici < 20). PERMESSO (default).")
         
         # Default: permetti
-        self.logger.debug(f"✅ Lingua CONSENTITA (default, nessuna regola di blocco attivata) per: '{clean_text[:100]}...'")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"✅ Lingua CONSENTITA (default, nessuna regola di blocco attivata) per: '{clean_text[:100]}...'")
         return False
 
     def update_system_prompt(self, new_prompt: str) -> bool:
@@ -826,60 +1279,496 @@ class AdvancedModerationBotLogic:
             self.logger.error(f"Errore aggiornamento prompt: {e}")
             return False
 
-    def analyze_with_openai(self, message_text: str) -> Tuple[bool, bool, bool]:
-        if not self.openai_client:
-            self.logger.warning("OpenAI client non disponibile. Analisi AI saltata.")
-            is_inappropriate_local = self.contains_banned_word(message_text) or \
-                                     self.contains_suspicious_contact_invitation(message_text)
-            final_is_disallowed_language = self.is_language_disallowed(message_text)
-            return is_inappropriate_local, False, final_is_disallowed_language
+    def has_telegram_link(self, text: str) -> bool:
+        """True se il testo contiene un link a un gruppo/canale Telegram."""
+        return TELEGRAM_LINK_RE.search(text) is not None
 
-        final_is_disallowed_language = self.is_language_disallowed(message_text)
+    def needs_ai_analysis(self, message_text: str) -> bool:
+        """
+        Pre-filtro economico: True se il messaggio contiene almeno un segnale
+        di rischio (AI_PRESCREEN_KEYWORDS) nel testo originale o normalizzato,
+        così da catturare anche le forme offuscate (es. 'p4n13r1').
+        """
+        if self.has_telegram_link(message_text):
+            return True
+        if _AI_PRESCREEN_RE.search(message_text.lower()):
+            return True
+        return bool(_AI_PRESCREEN_RE.search(self.normalize_text(message_text)))
+
+    def is_question_locally(self, message_text: str) -> bool:
+        """Stima locale del flag DOMANDA per i messaggi che non passano dall'AI."""
+        if '?' in message_text:
+            return True
+        words = message_text.lower().split(maxsplit=1)
+        return bool(words) and words[0].strip(',.!:;') in QUESTION_STARTERS
+
+    def _local_fallback_analysis(self, message_text: str, final_is_disallowed_language: bool) -> Tuple[bool, bool, bool]:
+        """Analisi di ripiego con i soli filtri locali (OpenAI non disponibile o in errore)."""
+        is_inappropriate_local = self.contains_banned_word(message_text) or \
+                                 self.contains_suspicious_contact_invitation(message_text) or \
+                                 (self.has_telegram_link(message_text) and
+                                  _DIDACTIC_MATERIAL_RE.search(message_text.lower()) is not None)
+        return is_inappropriate_local, False, final_is_disallowed_language
 
-        if len(message_text.strip()) <= 10 or re.match(r'^[^\w\s]+$', message_text.strip()):
-            self.logger.debug(f"Messaggio breve '{message_text[:20]}' skip analisi AI (contenuto/domanda). Lingua disallow (locale): {final_is_disallowed_language}")
+    def _pre_openai_result(self, message_text: str) -> Optional[Tuple[bool, bool, bool]]:
+        """
+        Restituisce il verdetto se è decidibile senza interrogare OpenAI
+        (messaggio breve, filtro diretto, cache), altrimenti None.
+        La lingua viene rilevata solo nei casi in cui serve al verdetto.
+        """
+        if len(message_text.strip()) <= 10 or _PUNCTUATION_ONLY_RE.match(message_text.strip()):
+            final_is_disallowed_language = self.is_language_disallowed(message_text)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Messaggio breve '{message_text[:20]}' skip analisi AI (contenuto/domanda). Lingua disallow (locale): {final_is_disallowed_language}")
             return False, False, final_is_disallowed_language
 
-        self.stats['total_messages_analyzed_by_openai'] += 1
+        # Il filtro diretto è già un verdetto definitivo: inutile interrogare OpenAI.
+        # Con un contenuto inappropriato la lingua non cambia l'esito, quindi non viene rilevata
+        if self.contains_banned_word(message_text):
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Filtro diretto già positivo per '{message_text[:50]}...', analisi AI e lingua saltate.")
+            return True, False, False
+
+        if self.config_manager.get('openai_prescreen_enabled', True) and not self.needs_ai_analysis(message_text):
+            is_question_local = self.is_question_locally(message_text)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Nessun segnale di rischio in '{message_text[:50]}...', analisi AI saltata. Domanda (locale): {is_question_local}")
+            return False, is_question_local, self.is_language_disallowed(message_text)
+
+        self.stats.total_messages_analyzed_by_openai += 1
         
+        # Allinea lo spazio delle chiavi della cache a prompt e modello correnti
+        self._system_message()
         cached_result_raw = self.analysis_cache.get(message_text)
         if cached_result_raw:
-            self.stats['openai_cache_hits'] += 1
+            self.stats.openai_cache_hits += 1
             cached_is_inappropriate, cached_is_question, _ = cached_result_raw
-            self.logger.debug(f"Risultato analisi (contenuto/domanda) da cache per: '{message_text[:50]}...'. Lingua ricalcolata localmente: {final_is_disallowed_language}")
-            actual_tuple_to_return = (cached_is_inappropriate, cached_is_question, final_is_disallowed_language)
-            self.analysis_cache.set(message_text, actual_tuple_to_return)
-            return actual_tuple_to_return
+            # La chiave di cache è il testo normalizzato: la lingua va ricalcolata sul testo
+            # originale, ma la voce in cache resta invariata
+            final_is_disallowed_language = self.is_language_disallowed(message_text)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Risultato analisi (contenuto/domanda) da cache per: '{message_text[:50]}...'. Lingua ricalcolata localmente: {final_is_disallowed_language}")
+            return cached_is_inappropriate, cached_is_question, final_is_disallowed_language
+        return None
+
+    def _store_openai_result(self, message_text: str, is_inappropriate_ai: bool, is_question_ai: bool,
+                             final_is_disallowed_language: bool, elapsed_ms: float) -> Tuple[bool, bool, bool]:
+        """
+        Aggiorna statistiche e cache con il verdetto ottenuto da OpenAI. Il tempo
+        impiegato è il costo della voce in cache: a parità di accessi vengono
+        rimossi prima i risultati ottenuti più rapidamente.
+        """
+        if is_inappropriate_ai or final_is_disallowed_language :
+             self.stats.ai_filter_violations +=1
+        analysis_tuple = (is_inappropriate_ai, is_question_ai, final_is_disallowed_language)
+        self.analysis_cache.set(message_text, analysis_tuple, cost=elapsed_ms)
+        return analysis_tuple
+
+    def _build_async_openai_client(self) -> AsyncOpenAI:
+        """
+        Client OpenAI asincrono con un proprio pool di connessioni keep-alive, riusato
+        da tutte le richieste. Con il pacchetto h2 installato usa HTTP/2, così le
+        richieste concorrenti condividono una sola connessione TLS.
+        """
+        return AsyncOpenAI(
+            http_client=DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE),
+            **self._async_openai_client_kwargs
+        )
+
+    async def aclose(self):
+        """
+        Chiude le connessioni del client OpenAI asincrono alla chiusura del bot e
+        conferma le scritture in sospeso della cache persistente.
+        Il client viene sostituito da uno nuovo (non ancora connesso) per un eventuale riavvio.
+        """
+        self.analysis_cache.flush()
+        if self.async_openai_client is not None:
+            await self.async_openai_client.close()
+            self.async_openai_client = self._build_async_openai_client()
+
+    def _system_message(self) -> Mapping[str, str]:
+        """
+        Messaggio di sistema (in sola lettura) per le richieste a OpenAI: il prompt
+        invariato seguito dalle lingue consentite. La parte variabile sta in fondo
+        così il prefisso resta identico tra le richieste (prompt caching di OpenAI).
+        Viene ricostruito solo quando prompt, lingue o modello cambiano; in quel
+        caso cambia anche lo spazio delle chiavi della cache delle analisi, così
+        non vengono riusati verdetti ottenuti con un prompt o un modello diverso.
+        """
+        source = (self.prompt_manager.get_current_prompt(), tuple(self.allowed_languages), self.openai_model)
+        if self._system_message_cache is None or self._system_message_source != source:
+            system_prompt, allowed_languages, model = source
+            if not allowed_languages or "any" in allowed_languages:
+                allowed_codes = "tutte"
+            else:
+                allowed_codes = ", ".join(LANGUAGE_CODE_MAPPING.get(lang.lower(), lang.lower()) for lang in allowed_languages)
+            self._system_message_cache = MappingProxyType({
+                "role": "system",
+                "content": f"{system_prompt}\n\nLingue consentite (codici ISO 639-1): {allowed_codes}",
+            })
+            self._system_message_source = source
+            self.analysis_cache.set_namespace(f"{model}\n{self._system_message_cache['content']}")
+        return self._system_message_cache
+
+    def _openai_circuit_open(self) -> bool:
+        """
+        True se OpenAI va saltato: dopo troppi errori consecutivi le analisi usano
+        i soli filtri locali per openai_circuit_breaker_reset_seconds, e dopo un 429
+        fino al momento indicato dalla risposta.
+        """
+        now = time.monotonic()
+        return now < self._openai_circuit_open_until or now < self._rate_limited_until
+
+    def _record_openai_failure(self):
+        """Conta un errore di OpenAI e apre il circuito oltre la soglia configurata."""
+        self._openai_consecutive_failures += 1
+        if self._openai_consecutive_failures >= self.config_manager.get('openai_circuit_breaker_failures', 5):
+            reset_seconds = self.config_manager.get('openai_circuit_breaker_reset_seconds', 30)
+            self._openai_circuit_open_until = time.monotonic() + reset_seconds
+            self._openai_consecutive_failures = 0
+            self.logger.warning(f"Troppi errori OpenAI consecutivi: analisi AI sospesa per {reset_seconds}s, uso i filtri locali.")
+
+    def _pause_openai_after_rate_limit(self, error: RateLimitError):
+        """
+        Dopo un 429 (già ritentato dal client) sospende le richieste a OpenAI per il
+        tempo indicato dalla risposta: nel frattempo si usano i filtri locali, invece
+        di continuare a inviare richieste che verrebbero rifiutate.
+        """
+        retry_after = rate_limit_retry_after(error.response.headers) or OPENAI_RATE_LIMIT_DEFAULT_PAUSE_SECONDS
+        self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + retry_after)
+        self.logger.warning(f"Limite di richieste OpenAI raggiunto: analisi AI sospesa per {retry_after:.1f}s, uso i filtri locali.")
+
+    def _record_openai_success(self):
+        self._openai_consecutive_failures = 0
+        self._openai_circuit_open_until = 0.0
+
+    def _use_structured_output(self) -> bool:
+        """True se le richieste usano response_format json_schema (openai_structured_output)."""
+        return (self.config_manager.get('openai_structured_output', True)
+                and self._structured_output_unsupported_model != self.openai_model)
+
+    def _structured_output_rejected(self, error: BadRequestError) -> bool:
+        """
+        True se la richiesta è stata rifiutata per il response_format json_schema
+        (modello o endpoint che non lo supportano): per il modello corrente si torna
+        al formato testuale e la richiesta va ripetuta.
+        """
+        if not self._use_structured_output() or "response_format" not in str(error) and "json_schema" not in str(error):
+            return False
+        self._structured_output_unsupported_model = self.openai_model
+        self.logger.warning(f"Output strutturato non supportato per '{self.openai_model}', uso il formato testuale: {error}")
+        return True
+
+    def _message_for_openai(self, message_text: str) -> str:
+        """
+        Testo inviato a OpenAI: oltre openai_max_message_chars caratteri restano solo
+        l'inizio e la fine del messaggio (dove stanno contatti, link e inviti),
+        così il costo in token e la latenza di un messaggio restano limitati.
+        """
+        if len(message_text) <= self.config_manager.get('openai_max_message_chars', OPENAI_MAX_MESSAGE_CHARS):
+            return message_text
+        self.stats.openai_truncated_messages += 1
+        return f"{message_text[:OPENAI_TRUNCATED_EDGE_CHARS]} [...] {message_text[-OPENAI_TRUNCATED_EDGE_CHARS:]}"
+
+    def _single_request_kwargs(self, message_text: str) -> Dict[str, Any]:
+        """Parametri della richiesta a OpenAI per un singolo messaggio."""
+        request_kwargs = dict(
+            model=self.openai_model,
+            messages=(
+                self._system_message(),
+                {"role": "user", "content": self._message_for_openai(message_text)}
+            ),
+            temperature=0.0,
+            max_tokens=OPENAI_MAX_TOKENS_SINGLE,
+            timeout=self.openai_timeout
+        )
+        if self._use_structured_output():
+            request_kwargs["response_format"] = OPENAI_VERDICT_RESPONSE_FORMAT
+        else:
+            # Servono solo le righe INAPPROPRIATO e DOMANDA: la generazione si ferma alla
+            # riga LINGUA (verificata localmente) o a una riga vuota (testo superfluo)
+            request_kwargs["stop"] = ["\n\n", "\nLINGUA"]
+        return request_kwargs
+
+    def _parse_single_response(self, message_text: str, response: Any) -> Tuple[bool, bool]:
+        """Estrae (inappropriato, domanda) dalla risposta a un singolo messaggio (JSON o testuale)."""
+        result_text = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Risposta OpenAI: '{result_text}' per messaggio: '{message_text[:50]}...'")
+        if result_text.startswith("{"):
+            try:
+                verdict_json = _json_loads(result_text)
+            except ValueError:
+                verdict_json = None
+            if isinstance(verdict_json, dict) and "inappropriato" in verdict_json:
+                return _json_flag(verdict_json["inappropriato"]), _json_flag(verdict_json.get("domanda"))
+        verdict = parse_openai_verdict(result_text)
+        if verdict is None:
+            # Gestita dai chiamanti come un errore: si ripiega sui filtri locali
+            raise ValueError(f"Risposta OpenAI non interpretabile: '{result_text[:100]}'")
+        is_inappropriate, is_question, _ = verdict
+        return is_inappropriate, is_question
+
+    def _batch_request_kwargs(self, messages: List[str]) -> Dict[str, Any]:
+        """Parametri della richiesta a OpenAI per un gruppo di messaggi."""
+        user_content = "\n\n".join(f"MESSAGGIO {index}:\n{self._message_for_openai(text)}"
+                                   for index, text in enumerate(messages, start=1))
+        if self._use_structured_output():
+            response_format = batch_verdict_response_format(len(messages))
+        else:
+            response_format = {"type": "json_object"}
+        return dict(
+            model=self.openai_model,
+            messages=(
+                self._system_message(),
+                _BATCH_INSTRUCTIONS_MESSAGE,
+                {"role": "user", "content": user_content}
+            ),
+            response_format=response_format,
+            temperature=0.0,
+            max_tokens=OPENAI_MAX_TOKENS_PER_MESSAGE * len(messages),
+            timeout=self.openai_timeout
+        )
+
+    def _parse_batch_response(self, messages: List[str], response: Any) -> List[Optional[Tuple[bool, bool]]]:
+        """
+        Estrae (inappropriato, domanda) per ogni messaggio della risposta batch.
+        Restituisce None per i messaggi senza un esito valido nella risposta.
+        """
+        result_text = response.choices[0].message.content or ""
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Risposta OpenAI (batch di {len(messages)} messaggi): '{result_text}'")
+
+        try:
+            verdicts = _json_loads(result_text)
+        except ValueError:
+            self.logger.warning("Risposta batch non è JSON valido, analisi singola dei messaggi.")
+            verdicts = {}
+        if not isinstance(verdicts, dict):
+            verdicts = {}
+
+        results: List[Optional[Tuple[bool, bool]]] = []
+        for index in range(1, len(messages) + 1):
+            verdict = verdicts.get(str(index))
+            if not isinstance(verdict, dict) or "inappropriato" not in verdict:
+                self.logger.warning(f"Risposta batch senza esito per il messaggio {index}, analisi singola.")
+                results.append(None)
+            else:
+                results.append((_json_flag(verdict.get("inappropriato")), _json_flag(verdict.get("domanda"))))
+        return results
 
-        self.stats['openai_requests'] += 1
-        system_prompt = self.prompt_manager.get_current_prompt()
+    def _request_openai_analysis(self, message_text: str) -> Tuple[bool, bool]:
+        """Singola richiesta a OpenAI. Restituisce (inappropriato, domanda)."""
+        self.stats.openai_requests += 1
+        response = self._create_chat_completion(lambda: self._single_request_kwargs(message_text))
+        return self._parse_single_response(message_text, response)
+
+    def _create_chat_completion(self, build_request_kwargs: Callable[[], Dict[str, Any]]) -> Any:
+        """
+        Richiesta sincrona a OpenAI. I parametri sono costruiti da build_request_kwargs,
+        così da poter ripetere la richiesta senza output strutturato se l'endpoint lo rifiuta.
+        """
         try:
-            response = self.openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": message_text}
-                ],
-                temperature=0.0,
-                max_tokens=50,
-                timeout=15
+            return self.openai_client.chat.completions.create(**build_request_kwargs())
+        except BadRequestError as e:
+            if not self._structured_output_rejected(e):
+                raise
+            return self.openai_client.chat.completions.create(**build_request_kwargs())
+        except RateLimitError as e:
+            self._pause_openai_after_rate_limit(e)
+            raise
+
+    async def _create_chat_completion_async(self, build_request_kwargs: Callable[[], Dict[str, Any]]) -> Any:
+        """
+        Variante asincrona di _create_chat_completion, con al massimo
+        openai_max_concurrent_requests richieste in volo e, se configurato,
+        openai_requests_per_minute richieste al minuto.
+        """
+        if self._openai_rate_limiter is not None:
+            # In attesa del gettone senza occupare uno slot di concorrenza
+            await self._openai_rate_limiter.acquire()
+        async with self._openai_semaphore:
+            try:
+                return await self.async_openai_client.chat.completions.create(**build_request_kwargs())
+            except BadRequestError as e:
+                if not self._structured_output_rejected(e):
+                    raise
+                return await self.async_openai_client.chat.completions.create(**build_request_kwargs())
+            except RateLimitError as e:
+                self._pause_openai_after_rate_limit(e)
+                raise
+
+    async def _request_openai_analysis_async(self, message_text: str) -> Tuple[bool, bool]:
+        """Variante asincrona di _request_openai_analysis."""
+        self.stats.openai_requests += 1
+        response = await self._create_chat_completion_async(lambda: self._single_request_kwargs(message_text))
+        return self._parse_single_response(message_text, response)
+
+    async def analyze_batch_with_openai_async(self, messages: List[str]) -> List[Union[Tuple[bool, bool], Exception]]:
+        """
+        Analizza più messaggi con una sola richiesta a OpenAI.
+        Restituisce (inappropriato, domanda) per ogni messaggio, nello stesso ordine.
+        I messaggi senza esito nella risposta batch vengono rianalizzati con richieste
+        concorrenti: se una di queste fallisce, al suo posto c'è l'eccezione, senza
+        perdere gli esiti degli altri messaggi.
+        """
+        if len(messages) == 1:
+            return [await self._request_openai_analysis_async(messages[0])]
+
+        self.stats.openai_requests += 1
+        response = await self._create_chat_completion_async(lambda: self._batch_request_kwargs(messages))
+        results = self._parse_batch_response(messages, response)
+        missing = [index for index, result in enumerate(results) if result is None]
+        if missing:
+            retried = await asyncio.gather(
+                *(self._request_openai_analysis_async(messages[index]) for index in missing),
+                return_exceptions=True,
             )
-            result_text = response.choices[0].message.content.strip() if response.choices[0].message.content else ""
-            self.logger.debug(f"Risposta OpenAI: '{result_text}' per messaggio: '{message_text[:50]}...'")
-            is_inappropriate_ai = "INAPPROPRIATO: SI" in result_text
-            is_question_ai = "DOMANDA: SI" in result_text
-            if is_inappropriate_ai or final_is_disallowed_language :
-                 self.stats['ai_filter_violations'] +=1
-            analysis_tuple = (is_inappropriate_ai, is_question_ai, final_is_disallowed_language)
-            self.analysis_cache.set(message_text, analysis_tuple)
-            return analysis_tuple
+            for index, result in zip(missing, retried):
+                if isinstance(result, BaseException) and not isinstance(result, Exception):
+                    raise result
+                results[index] = result
+        return results
+
+    def analyze_with_openai(self, message_text: str) -> Tuple[bool, bool, bool]:
+        if not self.openai_client:
+            self.logger.warning("OpenAI client non disponibile. Analisi AI saltata.")
+            return self._local_fallback_analysis(message_text, self.is_language_disallowed(message_text))
+
+        pre_result = self._pre_openai_result(message_text)
+        if pre_result is not None:
+            return pre_result
+
+        final_is_disallowed_language = self.is_language_disallowed(message_text)
+
+        if self._openai_circuit_open():
+            return self._local_fallback_analysis(message_text, final_is_disallowed_language)
+
+        started_at = time.perf_counter()
+        try:
+            is_inappropriate_ai, is_question_ai = self._request_openai_analysis(message_text)
         except OpenAIError as e:
+            self._record_openai_failure()
             self.logger.error(f"Errore API OpenAI: {e}", exc_info=True)
-            is_inappropriate_local = self.contains_banned_word(message_text) or \
-                                     self.contains_suspicious_contact_invitation(message_text)
-            return is_inappropriate_local, False, final_is_disallowed_language
+            return self._local_fallback_analysis(message_text, final_is_disallowed_language)
         except Exception as e:
+            self._record_openai_failure()
             self.logger.error(f"Errore imprevisto durante l'analisi OpenAI: {e}", exc_info=True)
-            is_inappropriate_local = self.contains_banned_word(message_text) or \
-                                     self.contains_suspicious_contact_invitation(message_text)
-            return is_inappropriate_local, False, final_is_disallowed_language
\ No newline at end of file
+            return self._local_fallback_analysis(message_text, final_is_disallowed_language)
+        self._record_openai_success()
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        return self._store_openai_result(message_text, is_inappropriate_ai, is_question_ai, final_is_disallowed_language, elapsed_ms)
+
+    async def analyze_with_openai_async(self, message_text: str) -> Tuple[bool, bool, bool]:
+        """
+        Variante asincrona di analyze_with_openai per il bot.
+        Le richieste che arrivano a breve distanza vengono raggruppate in
+        un'unica chiamata a OpenAI (vedi _openai_batch_worker).
+        """
+        if not self.async_openai_client:
+            return self.analyze_with_openai(message_text)
+
+        pre_result = self._pre_openai_result(message_text)
+        if pre_result is not None:
+            return pre_result
+
+        if self._openai_circuit_open():
+            return self._local_fallback_analysis(message_text, self.is_language_disallowed(message_text))
+
+        started_at = time.perf_counter()
+        analysis_future = self._enqueue_openai_analysis(message_text)
+        # Nel bot l'esito è già in cache (controllo lingua prima dell'analisi AI): la
+        # chiamata resta nel thread dell'event loop, dato che le cache non sono thread-safe
+        final_is_disallowed_language = self.is_language_disallowed(message_text)
+
+        try:
+            # shield: la cancellazione di un handler non deve annullare l'esito atteso dagli altri
+            is_inappropriate_ai, is_question_ai = await asyncio.shield(analysis_future)
+        except OpenAIError as e:
+            self.logger.error(f"Errore API OpenAI: {e}", exc_info=True)
+            return self._local_fallback_analysis(message_text, final_is_disallowed_language)
+        except Exception as e:
+            self.logger.error(f"Errore imprevisto durante l'analisi OpenAI: {e}", exc_info=True)
+            return self._local_fallback_analysis(message_text, final_is_disallowed_language)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        return self._store_openai_result(message_text, is_inappropriate_ai, is_question_ai, final_is_disallowed_language, elapsed_ms)
+
+    def _enqueue_openai_analysis(self, message_text: str) -> "asyncio.Future[Tuple[bool, bool]]":
+        """
+        Accoda il messaggio per la prossima richiesta batch e restituisce il future
+        con l'esito. Un messaggio identico (dopo normalizzazione) già in attesa di
+        risposta non viene accodato di nuovo: si riusa il future della richiesta in corso.
+        Va chiamato dall'event loop del bot.
+        """
+        loop = asyncio.get_running_loop()
+        # Il bot può essere riavviato in un nuovo event loop: coda e worker sono legati al loop
+        if self._batch_queue is None or self._batch_loop is not loop:
+            if self._batch_loop is not None:
+                # Le connessioni del pool appartengono al loop precedente: nuovo client
+                self.async_openai_client = self._build_async_openai_client()
+            self._batch_queue = asyncio.Queue()
+            self._batch_loop = loop
+            self._inflight_analyses = {}
+            self._openai_semaphore = asyncio.Semaphore(self.config_manager.get('openai_max_concurrent_requests', 8))
+            self._track_batch_task(loop.create_task(self._openai_batch_worker(self._batch_queue)))
+
+        inflight_key = normalize_for_cache(message_text)
+        future = self._inflight_analyses.get(inflight_key)
+        if future is None:
+            future = loop.create_future()
+            self._inflight_analyses[inflight_key] = future
+            future.add_done_callback(lambda _: self._inflight_analyses.pop(inflight_key, None))
+            self._batch_queue.put_nowait((message_text, future))
+        else:
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Messaggio identico già in analisi, attendo l'esito: '{message_text[:50]}...'")
+        return future
+
+    async def _openai_batch_worker(self, queue: asyncio.Queue):
+        """
+        Raccoglie i messaggi in coda per al massimo openai_batch_wait_ms (o fino a
+        openai_batch_max_size messaggi) e li invia insieme. Con dimensione 1 ogni
+        messaggio viene inviato subito con una richiesta singola.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            max_size = max(1, self.config_manager.get('openai_batch_max_size', OPENAI_BATCH_MAX_SIZE))
+            if self.config_manager.get_concurrent_updates() <= 1:
+                # Update gestiti uno alla volta: nessun altro messaggio può arrivare durante l'attesa
+                max_size = 1
+            wait_seconds = self.config_manager.get('openai_batch_wait_ms', OPENAI_BATCH_WAIT_SECONDS * 1000) / 1000
+            deadline = loop.time() + wait_seconds
+            while len(batch) < max_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            self._track_batch_task(loop.create_task(self._dispatch_openai_batch(batch)))
+
+    def _track_batch_task(self, task: asyncio.Task):
+        """Mantiene un riferimento ai task in background finché non terminano."""
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _dispatch_openai_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Esegue la richiesta batch con il client asincrono e consegna gli esiti."""
+        try:
+            results = await self.analyze_batch_with_openai_async([text for text, _ in batch])
+        except Exception as e:
+            self._record_openai_failure()
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self._record_openai_success()
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)